@@ -1,13 +1,17 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 from langchain.agents import AgentExecutor
 from langchain.agents import Tool, OpenAIFunctionsAgent
 from langchain_community.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.memory import ConversationBufferMemory
 from langchain.schema import SystemMessage
+import asyncio
 import logging
 
-from ..services.gemini_service import gemini_service
+from ..services.llm import get_llm_provider
+from ..config import settings
+from . import prompt_builder
+from .pipeline import CaseContext, Stage, StageScheduler
 from .tools.law_lookup import LawLookupTool
 from .tools.draft_generator import DraftGeneratorTool
 from .tools.ngo_finder import NGOFinderTool
@@ -48,8 +52,7 @@ class LegalAgent:
         ]
         
         # Load system prompt
-        with open("app/agent/prompts/system.txt", "r") as f:
-            system_prompt = f.read()
+        system_prompt = prompt_builder.system_prompt()
         
         # Create prompt template
         self.prompt = ChatPromptTemplate.from_messages([
@@ -90,6 +93,43 @@ class LegalAgent:
             tools=self.tools
         )
     
+    def _build_scheduler(self, context: CaseContext) -> StageScheduler:
+        """Declare the case pipeline stages and their dependencies"""
+        async def run_analysis():
+            # Get legal analysis from Gemini (computed once, shared by all tools)
+            return await context.get_analysis()
+        
+        # The local tools are synchronous; run them on a thread so they do not
+        # block the event loop and their stage timeout can fire
+        async def run_law_lookup():
+            return await asyncio.to_thread(self.law_lookup.run, {
+                "query": context.description,
+                "category": context.category,
+                "location": context.location
+            })
+        
+        async def run_draft(analysis, laws):
+            return await self.draft_generator.run(
+                context.tool_input(laws=laws, analysis=analysis)
+            )
+        
+        async def run_ngo_finder():
+            return await asyncio.to_thread(self.ngo_finder.run, context.category)
+        
+        async def run_next_steps(analysis):
+            return await self.next_steps.run(
+                context.tool_input(analysis=analysis)
+            )
+        
+        # Only the draft and next steps wait on other stages; the rest run concurrently
+        return StageScheduler([
+            Stage("analysis", run_analysis, timeout=settings.agent_llm_stage_timeout),
+            Stage("laws", run_law_lookup, timeout=settings.agent_local_stage_timeout),
+            Stage("ngos", run_ngo_finder, timeout=settings.agent_local_stage_timeout),
+            Stage("draft", run_draft, depends_on=["analysis", "laws"], timeout=settings.agent_llm_stage_timeout),
+            Stage("next_steps", run_next_steps, depends_on=["analysis"], timeout=settings.agent_llm_stage_timeout)
+        ])
+    
     async def process_case(
         self,
         title: str,
@@ -99,52 +139,60 @@ class LegalAgent:
     ) -> Dict[str, Any]:
         """Process a legal case and generate a comprehensive response"""
         try:
-            # Get legal analysis from Gemini
-            analysis = await gemini_service.generate_legal_analysis(
+            context = CaseContext(
                 title=title,
                 description=description,
                 category=category,
                 location=location
             )
-            
-            # Get applicable laws
-            laws = self.law_lookup.run({
-                "query": description,
-                "category": category,
-                "location": location
-            })
-            
-            # Generate draft
-            draft = await self.draft_generator.run({
-                "title": title,
-                "description": description,
-                "category": category,
-                "laws": laws,
-                "location": location
-            })
-            
-            # Find relevant NGOs
-            ngos = self.ngo_finder.run(category)
-            
-            # Get next steps
-            next_steps = await self.next_steps.run({
-                "title": title,
-                "description": description,
-                "category": category,
-                "location": location
-            })
+            scheduler = self._build_scheduler(context)
+            results = await scheduler.run()
+            logger.info(f"Case pipeline stage timings (ms): {scheduler.timings}")
             
             return {
-                "draft": draft,
-                "applicable_laws": laws,
-                "suggested_ngos": ngos,
-                "next_steps": next_steps,
-                "analysis": analysis
+                "draft": results["draft"],
+                "applicable_laws": results["laws"],
+                "suggested_ngos": results["ngos"],
+                "next_steps": results["next_steps"],
+                "analysis": results["analysis"],
+                "timings": scheduler.timings
             }
         except Exception as e:
             logger.error(f"Error processing case: {str(e)}", exc_info=True)
             raise
     
+    async def process_case_stream(
+        self,
+        title: str,
+        description: str,
+        category: str,
+        location: str
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Process a legal case, yielding (event, data) pairs as each stage produces output.
+        
+        The analysis is streamed as text chunks; every other stage is emitted as one
+        section in pipeline order, each preceded by a numbered section marker.
+        """
+        context = CaseContext(
+            title=title,
+            description=description,
+            category=category,
+            location=location
+        )
+        yield "section", {"index": 0, "section": "analysis"}
+        async for chunk in context.stream_analysis():
+            yield "chunk", {"section": "analysis", "text": chunk}
+        
+        scheduler = self._build_scheduler(context)
+        index = 1
+        async for name, result in scheduler.stream():
+            if name == "analysis":
+                continue
+            yield "section", {"index": index, "section": name}
+            yield "result", {"section": name, "data": result}
+            index += 1
+        yield "done", {"timings": scheduler.timings}
+    
     async def chat(self, message: str) -> str:
         """Handle chat interactions with the agent"""
         if self.agent_executor:
@@ -152,6 +200,19 @@ class LegalAgent:
             response = await self.agent_executor.arun(message)
             return response
         else:
-            # Fallback to Gemini
-            response = await gemini_service.generate_content(message)
-            return response if response else "I apologize, but I'm unable to process your request at this time." 
\ No newline at end of file
+            # Fallback to the configured LLM provider (Gemini by default)
+            response = await get_llm_provider().generate_content(message)
+            return response if response else "I apologize, but I'm unable to process your request at this time." 
+    
+    async def chat_stream(self, message: str) -> AsyncIterator[str]:
+        """Stream chat responses as text chunks"""
+        if self.agent_executor:
+            # The OpenAI agent does not stream; send its answer as a single chunk
+            yield await self.agent_executor.arun(message)
+            return
+        streamed = False
+        async for chunk in get_llm_provider().stream_content(message):
+            streamed = True
+            yield chunk
+        if not streamed:
+            yield "I apologize, but I'm unable to process your request at this time."
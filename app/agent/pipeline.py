@@ -0,0 +1,155 @@
+from typing import Dict, Any, Optional, Callable, Awaitable, Sequence, AsyncIterator, Tuple
+import asyncio
+import time
+
+from ..services.llm import get_llm_provider
+
+class CaseContext:
+    """Request-scoped state shared by every stage of LegalAgent.process_case"""
+
+    def __init__(
+        self,
+        title: str,
+        description: str,
+        category: str,
+        location: Optional[str] = None
+    ):
+        self.title = title
+        self.description = description
+        self.category = category
+        self.location = location
+        self._analysis: Optional[asyncio.Future] = None
+
+    async def get_analysis(self) -> Dict[str, Any]:
+        """Generate the legal analysis once per case and share it with every caller"""
+        if self._analysis is None:
+            self._analysis = asyncio.ensure_future(
+                get_llm_provider().generate_legal_analysis(
+                    title=self.title,
+                    description=self.description,
+                    category=self.category,
+                    location=self.location
+                )
+            )
+        return await asyncio.shield(self._analysis)
+
+    async def stream_analysis(self) -> AsyncIterator[str]:
+        """Stream the legal analysis text and keep the result for the later stages"""
+        provider = get_llm_provider()
+        prompt = provider.build_legal_analysis_prompt(
+            self.title, self.description, self.category, self.location
+        )
+        chunks = []
+        async for chunk in provider.stream_content(prompt):
+            chunks.append(chunk)
+            yield chunk
+        analysis = asyncio.get_running_loop().create_future()
+        analysis.set_result(provider.format_legal_analysis("".join(chunks)))
+        self._analysis = analysis
+
+    def tool_input(self, **extra: Any) -> Dict[str, Any]:
+        """Build the input dict passed to the agent tools"""
+        case = {
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+            "location": self.location
+        }
+        case.update(extra)
+        return case
+
+
+class Stage:
+    """A named unit of work in the case pipeline and the stages it depends on"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        depends_on: Sequence[str] = (),
+        timeout: Optional[float] = None
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+
+class StageScheduler:
+    """Run pipeline stages concurrently, starting each one as soon as its dependencies finish.
+
+    Each stage function receives the results of its dependencies as keyword
+    arguments named after the dependency stages.
+    """
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+        self._check_acyclic()
+        self.timings: Dict[str, float] = {}
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle detected at '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def _run_stage(self, stage: Stage, tasks: Dict[str, asyncio.Task]) -> Any:
+        inputs = {}
+        for dependency in stage.depends_on:
+            inputs[dependency] = await tasks[dependency]
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(stage.func(**inputs), timeout=stage.timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Stage '{stage.name}' timed out after {stage.timeout}s")
+        finally:
+            self.timings[stage.name] = round((time.perf_counter() - start) * 1000, 2)
+
+    def _start(self) -> Dict[str, asyncio.Task]:
+        self.timings = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        for name, stage in self.stages.items():
+            tasks[name] = asyncio.ensure_future(self._run_stage(stage, tasks))
+        return tasks
+
+    @staticmethod
+    async def _cancel(tasks: Dict[str, asyncio.Task]):
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all stages and return their results keyed by stage name"""
+        tasks = self._start()
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            await self._cancel(tasks)
+            raise
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def stream(self) -> AsyncIterator[Tuple[str, Any]]:
+        """Run all stages concurrently, yielding (name, result) in declaration order"""
+        tasks = self._start()
+        try:
+            for name, task in tasks.items():
+                yield name, await task
+        finally:
+            await self._cancel(tasks)
@@ -0,0 +1,105 @@
+"""Assemble LLM prompts from the templates in app/agent/prompts within token budgets.
+
+Templates are read from disk once. Only the fields a prompt needs are
+interpolated, and long free-text fields (case descriptions, prior analysis)
+are truncated deterministically so every prompt fits its token budget.
+"""
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..config import settings
+
+PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " [...]"
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> str:
+    """Read a prompt template by name (without the .txt suffix), caching it for the process"""
+    return (PROMPTS_DIR / f"{name}.txt").read_text(encoding="utf-8").rstrip("\n")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting; ~4 characters per token for English text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to fit max_tokens, preferring a word boundary and marking the cut"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+    if limit <= 0:
+        return ""
+    cut = text[:limit]
+    boundary = cut.rfind(" ")
+    if boundary > limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+def analysis_text(analysis: Any) -> str:
+    """Pull the analysis text out of a generate_legal_analysis result"""
+    if analysis is None:
+        return ""
+    if isinstance(analysis, dict):
+        return str(analysis.get("analysis") or "")
+    return str(analysis)
+
+def fit_fields(fields: Dict[str, str], available: int, truncatable: Iterable[str]) -> Dict[str, str]:
+    """Truncate the given fields so together they fit in `available` tokens.
+
+    Short fields are kept whole and the remaining budget is split evenly
+    between the longer ones, so the result only depends on the inputs.
+    """
+    sizes = {name: estimate_tokens(fields[name]) for name in truncatable}
+    if sum(sizes.values()) <= available:
+        return fields
+    fitted = dict(fields)
+    remaining = max(available, 0)
+    pending = sorted(sizes, key=lambda name: (sizes[name], name))
+    while pending:
+        share = remaining // len(pending)
+        name = pending.pop(0)
+        fitted[name] = truncate_to_tokens(fields[name], min(sizes[name], share))
+        remaining -= estimate_tokens(fitted[name])
+    return fitted
+
+def render(name: str, max_tokens: int, truncatable: Iterable[str], **fields: str) -> str:
+    """Fill a template, truncating the `truncatable` fields to keep it within max_tokens"""
+    truncatable = tuple(truncatable)
+    template = load_template(name)
+    skeleton = template.format(**{key: "" if key in truncatable else value for key, value in fields.items()})
+    available = max_tokens - estimate_tokens(skeleton)
+    return template.format(**fit_fields(fields, available, truncatable))
+
+def system_prompt() -> str:
+    return load_template("system")
+
+def build_legal_analysis_prompt(title: str, description: str, category: str, location: Optional[str] = None) -> str:
+    """Prompt for the shared case analysis"""
+    return render(
+        "legal_analysis",
+        settings.prompt_analysis_max_tokens,
+        ("description",),
+        title=title or "",
+        description=description or "",
+        category=category or "",
+        location=location or "Not specified"
+    )
+
+def build_next_steps_prompt(title: str, description: str, category: str, location: str, analysis: Any) -> str:
+    """Prompt for next steps, embedding only the analysis text rather than the whole result dict"""
+    return render(
+        "next_steps",
+        settings.prompt_next_steps_max_tokens,
+        ("description", "analysis"),
+        title=title or "",
+        description=description or "",
+        category=category or "",
+        location=location or "",
+        analysis=analysis_text(analysis)
+    )
+
+def build_draft_analysis(analysis: Any) -> str:
+    """Analysis section appended to generated drafts, capped at settings.draft_analysis_max_tokens"""
+    return truncate_to_tokens(analysis_text(analysis), settings.draft_analysis_max_tokens)
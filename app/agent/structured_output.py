@@ -0,0 +1,114 @@
+"""Response schemas for structured (JSON) LLM output and their validation.
+
+The schemas use the OpenAPI subset accepted by Gemini's `responseSchema`.
+Output is validated once, when it is generated, so stored cases and read
+endpoints only ever see the validated shape.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from ..models.case_schema import LegalAnalysisResult, NextStep
+
+logger = logging.getLogger(__name__)
+
+_STRING = {"type": "STRING"}
+_STRING_LIST = {"type": "ARRAY", "items": _STRING}
+
+NEXT_STEP_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "step": _STRING,
+        "actions": _STRING_LIST,
+        "timeline": _STRING
+    },
+    "required": ["step", "actions"]
+}
+
+NEXT_STEPS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "steps": {"type": "ARRAY", "items": NEXT_STEP_SCHEMA}
+    },
+    "required": ["steps"]
+}
+
+LEGAL_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "laws": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "act": _STRING,
+                    "section": _STRING,
+                    "relevance": _STRING
+                },
+                "required": ["act"]
+            }
+        },
+        "grounds": _STRING_LIST,
+        "steps": {"type": "ARRAY", "items": NEXT_STEP_SCHEMA},
+        "timeline": _STRING,
+        "challenges": _STRING_LIST
+    },
+    "required": ["laws", "grounds", "steps", "challenges"]
+}
+
+def _load(text: Optional[str]) -> Any:
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        logger.warning("LLM returned invalid JSON for a structured request")
+        return None
+
+def parse_next_steps(text: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+    """Validate a NEXT_STEPS_SCHEMA response, returning the steps as plain dicts"""
+    data = _load(text)
+    if isinstance(data, dict):
+        data = data.get("steps")
+    if not isinstance(data, list):
+        return None
+    try:
+        return [NextStep.model_validate(step).model_dump() for step in data]
+    except ValidationError as e:
+        logger.warning(f"Next steps response failed validation: {str(e)}")
+        return None
+
+def parse_legal_analysis(text: Optional[str]) -> Optional[LegalAnalysisResult]:
+    """Validate a LEGAL_ANALYSIS_SCHEMA response"""
+    data = _load(text)
+    if not isinstance(data, dict):
+        return None
+    try:
+        return LegalAnalysisResult.model_validate(data)
+    except ValidationError as e:
+        logger.warning(f"Legal analysis response failed validation: {str(e)}")
+        return None
+
+def render_legal_analysis(result: LegalAnalysisResult) -> str:
+    """Plain-text rendering of a structured analysis, used in drafts and follow-up prompts"""
+    lines = []
+    if result.laws:
+        lines.append("Applicable laws:")
+        for law in result.laws:
+            reference = f"{law.act}, {law.section}" if law.section else law.act
+            lines.append(f"- {reference}: {law.relevance}" if law.relevance else f"- {reference}")
+    if result.grounds:
+        lines.append("Legal grounds:")
+        lines.extend(f"- {ground}" for ground in result.grounds)
+    if result.steps:
+        lines.append("Next steps:")
+        for step in result.steps:
+            lines.append(f"- {step.step} ({step.timeline})" if step.timeline else f"- {step.step}")
+    if result.timeline:
+        lines.append(f"Timeline: {result.timeline}")
+    if result.challenges:
+        lines.append("Potential challenges:")
+        lines.extend(f"- {challenge}" for challenge in result.challenges)
+    return "\n".join(lines)
@@ -1,7 +1,9 @@
 from typing import Dict, Any
 from langchain_community.tools import BaseTool
 from datetime import datetime
-from ...services.gemini_service import gemini_service
+from ...services.llm import get_llm_provider
+from ...services.resilience import UpstreamUnavailableError
+from ..prompt_builder import build_draft_analysis
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,16 +24,20 @@ class DraftGeneratorTool(BaseTool):
                     "description": kwargs.get("description", ""),
                     "category": kwargs.get("category", ""),
                     "laws": kwargs.get("laws", []),
-                    "location": kwargs.get("location", "")
+                    "location": kwargs.get("location", ""),
+                    "analysis": kwargs.get("analysis")
                 }
             
-            # Get Gemini analysis first
-            analysis = await gemini_service.generate_legal_analysis(
-                title=case.get("title", ""),
-                description=case.get("description", ""),
-                category=case.get("category", ""),
-                location=case.get("location", "")
-            )
+            # Reuse the analysis computed by the pipeline, falling back to Gemini
+            analysis = case.get("analysis")
+            if analysis is None:
+                analysis = await get_llm_provider().generate_legal_analysis(
+                    title=case.get("title", ""),
+                    description=case.get("description", ""),
+                    category=case.get("category", ""),
+                    location=case.get("location", "")
+                )
+            analysis = build_draft_analysis(analysis)
             
             # Check for threat-related keywords
             threat_keywords = ["threat", "kill", "murder", "assault", "violence", "abuse", "harass"]
@@ -184,6 +190,8 @@ LEGAL ANALYSIS:
 {analysis}"""
 
             return draft
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error generating draft: {str(e)}", exc_info=True)
             return f"Error generating draft: {str(e)}"
@@ -1,6 +1,9 @@
 from typing import List, Dict, Any
 from langchain.tools import BaseTool
-from ...services.gemini_service import gemini_service
+from ...services.llm import get_llm_provider
+from ...services.resilience import UpstreamUnavailableError
+from ..prompt_builder import build_next_steps_prompt
+from ..structured_output import NEXT_STEPS_SCHEMA, parse_next_steps
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,7 +12,7 @@ class NextStepsTool(BaseTool):
     name = "next_steps"
     description = "Provide next steps and timeline for legal proceedings"
     
-    async def _run(self, *args, **kwargs) -> List[str]:
+    async def _run(self, *args, **kwargs) -> List[Dict[str, Any]]:
         """Generate next steps based on case details"""
         try:
             # Handle both dictionary and individual arguments
@@ -18,74 +21,75 @@ class NextStepsTool(BaseTool):
             else:
                 case = {
                     "category": kwargs.get("category", ""),
-                    "case_title": kwargs.get("case_title", ""),
+                    "case_title": kwargs.get("case_title") or kwargs.get("title", ""),
                     "description": kwargs.get("description", ""),
-                    "location": kwargs.get("location", "")
+                    "location": kwargs.get("location", ""),
+                    "analysis": kwargs.get("analysis")
                 }
+            if not case.get("case_title"):
+                case["case_title"] = case.get("title", "")
             
-            # Get legal analysis and next steps from Gemini
-            analysis = await gemini_service.generate_legal_analysis(
-                title=case.get("case_title", ""),
-                description=case.get("description", ""),
-                category=case.get("category", ""),
-                location=case.get("location", "")
-            )
+            # Reuse the analysis computed by the pipeline, falling back to Gemini
+            analysis = case.get("analysis")
+            if analysis is None:
+                analysis = await get_llm_provider().generate_legal_analysis(
+                    title=case.get("case_title", ""),
+                    description=case.get("description", ""),
+                    category=case.get("category", ""),
+                    location=case.get("location", "")
+                )
             
-            # Generate structured next steps using Gemini, tailored for Indian context and Markdown formatting
-            prompt = f"""Based on the following case details, generate a structured list of next steps with specific actions and timelines, tailored for the Indian legal and social context:
-
-Title: {case.get('case_title', '')}
-Description: {case.get('description', '')}
-Category: {case.get('category', '')}
-Location: {case.get('location', '')}
-
-Legal Analysis: {analysis}
-
-Please provide:
-1. Immediate safety measures (mention Indian emergency number 112, local police, and FIR process)
-2. Legal documentation requirements (reference Indian laws and procedures)
-3. Legal protection options (such as Protection Orders, approaching Magistrate, etc.)
-4. Support services and organizations (Indian NGOs, NALSA, helplines, etc.)
-5. Ongoing safety measures (culturally relevant)
-6. Legal proceedings timeline (Indian court process)
-
-Format the output using Markdown for bold, italics, and lists. Use clear line breaks between steps and actions."""
+            # Generate structured next steps, passing only the analysis text within the prompt budget
+            prompt = build_next_steps_prompt(
+                title=case.get('case_title', ''),
+                description=case.get('description', ''),
+                category=case.get('category', ''),
+                location=case.get('location', ''),
+                analysis=analysis
+            )
 
-            next_steps = await gemini_service.generate_content(prompt)
+            response = await get_llm_provider().generate_content(prompt, response_schema=NEXT_STEPS_SCHEMA)
             
-            # Convert the response into a list of strings
-            steps = []
-            if next_steps:
-                # Split by newlines and filter out empty lines
-                steps = [step.strip() for step in next_steps.split('\n') if step.strip()]
+            # Validate the JSON steps once here so they are stored already structured
+            steps = parse_next_steps(response)
+            if steps is None:
+                # Provider ignored the schema; keep each non-empty line as a step
+                lines = response.split('\n') if response else []
+                steps = [{"step": line.strip(), "actions": [], "timeline": None} for line in lines if line.strip()]
             
             return steps
             
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error generating next steps: {str(e)}", exc_info=True)
-            return [f"Error generating next steps: {str(e)}"]
+            return [{"step": f"Error generating next steps: {str(e)}", "actions": [], "timeline": None}]
     
     async def _arun(self, case: Dict[str, Any]) -> Dict[str, Any]:
         """Async implementation of the tool"""
         try:
-            # Get next steps
-            next_steps = await self._run(case)
+            # Get legal analysis once and share it with the next steps prompt
+            analysis = case.get('analysis')
+            if analysis is None:
+                analysis = await get_llm_provider().generate_legal_analysis(
+                    title=case.get('title', ''),
+                    description=case.get('description', ''),
+                    category=case.get('category', ''),
+                    location=case.get('location', '')
+                )
             
-            # Get legal analysis
-            analysis = await gemini_service.generate_legal_analysis(
-                title=case.get('title', ''),
-                description=case.get('description', ''),
-                category=case.get('category', ''),
-                location=case.get('location', '')
-            )
+            # Get next steps
+            next_steps = await self._run({**case, 'analysis': analysis})
             
             return {
                 'next_steps': next_steps,
                 'analysis': analysis
             }
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error in async execution: {str(e)}", exc_info=True)
             return {
-                'next_steps': [f"Error generating next steps: {str(e)}"],
+                'next_steps': [{"step": f"Error generating next steps: {str(e)}", "actions": [], "timeline": None}],
                 'analysis': "Error generating analysis"
             }
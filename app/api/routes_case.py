@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from app.models.db_models import Case
+from app.models.case import Case
 from app.database import get_db
 
 router = APIRouter()
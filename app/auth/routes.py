@@ -1,7 +1,9 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.user import User
 from app.models.user_schema import UserCreate, UserLogin, UserResponse, Token
 from app.auth.utils import verify_password, get_password_hash, create_access_token
@@ -14,18 +16,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/signup", response_model=Token)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
-    print("DEBUG: Signup function called with user:", user)
-    print("DEBUG: Database session:", db)
+    logger.debug("Signup requested", extra={"username": user.username})
     # Check if user already exists
     try:
-        db_user = db.query(User).filter(
+        result = await db.execute(select(User).where(
             (User.email == user.email) | (User.username == user.username)
-        ).first()
-        print("DEBUG: Query executed successfully")
+        ))
+        db_user = result.scalars().first()
     except Exception as e:
-        print("DEBUG: Database query error:", str(e))
+        logger.error(f"Signup lookup error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
     
     if db_user:
@@ -35,17 +36,9 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
-    print("DEBUG: Creating user with data:", {
-        "email": user.email,
-        "username": user.username,
-        "full_name": user.full_name,
-        "phone": user.phone,
-        "location": user.location,
-        "hashed_password": hashed_password
-    })
+    # bcrypt is CPU-bound; keep it off the event loop
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
     try:
-        print("DEBUG: About to create User object")
         db_user = User(
             email=user.email,
             username=user.username,
@@ -54,16 +47,11 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
             location=user.location,
             hashed_password=hashed_password
         )
-        print("DEBUG: User object created successfully:", db_user)
-        print("DEBUG: About to add user to database")
         db.add(db_user)
-        print("DEBUG: About to commit transaction")
-        db.commit()
-        print("DEBUG: About to refresh user object")
-        db.refresh(db_user)
-        print("DEBUG: User object refreshed successfully")
+        await db.commit()
+        await db.refresh(db_user)
+        logger.info("User created", extra={"user_id": db_user.id})
     except Exception as e:
-        print("DEBUG: Database error:", str(e))
         logger.error(f"Signup error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Database error occurred: {str(e)}")
     # Create access token
@@ -79,12 +67,13 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token"""
     try:
-        user = db.query(User).filter(User.username == user_credentials.username).first()
+        result = await db.execute(select(User).where(User.username == user_credentials.username))
+        user = result.scalars().first()
         
-        if not user or not verify_password(user_credentials.password, user.hashed_password):
+        if not user or not await run_in_threadpool(verify_password, user_credentials.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password"
@@ -111,6 +100,6 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
         )
 
 @router.get("/me", response_model=UserResponse)
-def read_users_me(current_user: User = Depends(get_current_active_user)):
+async def read_users_me(current_user: User = Depends(get_current_active_user)):
     """Get current user information"""
     return current_user
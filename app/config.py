@@ -5,18 +5,125 @@ from typing import Optional, List
 class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./app.db"
+    # Defaults to database_url with its async driver (aiosqlite / asyncpg)
+    async_database_url: Optional[str] = None
+    
+    # Postgres connection pool (per engine)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 10.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    
+    # SQLite pragmas applied to every connection
+    db_sqlite_journal_mode: str = "WAL"
+    db_sqlite_synchronous: str = "NORMAL"
+    db_sqlite_busy_timeout_ms: int = 5000
+    db_sqlite_mmap_size: int = 268435456
     
     # JWT
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     
+    # LLM provider: "gemini", "openai" or "fake" (offline, deterministic)
+    llm_provider: str = "gemini"
+    
+    # Hedged LLM requests: after the primary exceeds its tracked latency
+    # percentile, also ask llm_hedge_provider and keep the first good answer
+    llm_hedge_enabled: bool = False
+    llm_hedge_provider: str = "openai"
+    llm_hedge_percentile: float = 95.0
+    llm_hedge_min_samples: int = 20
+    llm_hedge_initial_delay: float = 10.0
+    llm_hedge_max_rate: float = 0.1
+    
+    # Prompt token budgets (estimated at ~4 characters per token)
+    prompt_analysis_max_tokens: int = 1500
+    prompt_next_steps_max_tokens: int = 2000
+    draft_analysis_max_tokens: int = 600
+    
     # Google Gemini API
     gemini_api_key: str = os.getenv("GEMINI_API_KEY")
     gemini_api_url: str = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+
+    # Gemini HTTP connection pool
+    gemini_max_connections: int = 20
+    gemini_max_keepalive_connections: int = 10
+    gemini_keepalive_expiry: float = 30.0
+    gemini_http2: bool = True
+    gemini_connect_timeout: float = 5.0
+    gemini_read_timeout: float = 30.0
+    gemini_write_timeout: float = 10.0
+    gemini_pool_timeout: float = 5.0
+
+    # Gemini admission control: adaptive concurrency, retries and circuit breaker
+    gemini_concurrency_initial: int = 8
+    gemini_concurrency_min: int = 1
+    gemini_concurrency_max: int = 20
+    gemini_latency_target: float = 15.0
+    gemini_max_retries: int = 3
+    gemini_retry_base_delay: float = 0.5
+    gemini_retry_max_delay: float = 8.0
+    gemini_breaker_failure_threshold: int = 5
+    gemini_breaker_recovery_timeout: float = 30.0
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "./llm_cache.db"
+    llm_cache_max_entries: int = 1000
+    llm_cache_ttl: float = 86400.0
+
+    # Background case processing
+    case_job_workers: int = 4
+    case_job_queue_size: int = 100
+
+    # Batch case submission
+    case_batch_max_items: int = 100
+    case_batch_concurrency: int = 8
+    case_batch_chunk_size: int = 20
+
+    # GET /cases/ pagination
+    cases_page_size: int = 20
+    cases_max_page_size: int = 100
+    # Search results are ranked, so they page by offset; deep pages are refused
+    cases_search_max_offset: int = 1000
+    # GET /cases/changes never advances its token past now minus this many
+    # seconds, so writes still committing are picked up by the next sync
+    cases_sync_settle_seconds: int = 5
+
+    # Case pipeline stage timeouts (seconds)
+    agent_llm_stage_timeout: float = 60.0
+    agent_local_stage_timeout: float = 5.0
     
     # OpenAI API (for fallback)
     openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+    openai_model: str = "gpt-4-turbo-preview"
+    openai_timeout: float = 30.0
+    openai_max_retries: int = 3
+    
+    # Fake LLM provider (load tests and benchmarks)
+    fake_llm_latency_distribution: str = "lognormal"
+    fake_llm_latency_mean: float = 1.0
+    fake_llm_latency_stddev: float = 0.3
+    fake_llm_error_rate: float = 0.0
+    fake_llm_response_words: int = 200
+    fake_llm_seed: int = 42
+    
+    # Logging: JSON lines written from a background thread; large LLM
+    # payloads are logged for a sampled fraction of calls, truncated
+    log_level: str = "INFO"
+    log_json: bool = True
+    log_payload_sample_rate: float = 0.01
+    log_payload_max_chars: int = 500
+    
+    # Response encoding: orjson as the default JSON encoder (when installed),
+    # Brotli/gzip compression for bodies of at least response_compression_min_size bytes
+    fast_json_responses: bool = True
+    response_compression_enabled: bool = True
+    response_compression_min_size: int = 1024
+    response_gzip_level: int = 6
+    response_brotli_quality: int = 4
     
     # App
     app_name: str = "Legal Aid Platform"
@@ -1,13 +1,156 @@
-from sqlalchemy import create_engine
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Async drivers for the sync URLs in settings.database_url
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg"
+}
+
+def to_async_url(url: str) -> str:
+    """Swap a sync database URL onto its async driver (aiosqlite / asyncpg)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+class PoolMetrics:
+    """Connection checkouts, checkout wait times and pool timeouts for one engine"""
+
+    def __init__(self):
+        self.connections_total = 0
+        self.checkouts_total = 0
+        self.timeouts_total = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, waited: float) -> None:
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+
+    def listen(self, sync_engine: Engine) -> None:
+        """Count new connections and checkouts through the engine's pool events"""
+        @event.listens_for(sync_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self.connections_total += 1
+
+        @event.listens_for(sync_engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            self.checkouts_total += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connections_total": self.connections_total,
+            "checkouts_total": self.checkouts_total,
+            "timeouts_total": self.timeouts_total,
+            "wait_time_avg_ms": round(self.wait_time_total / self.checkouts_total * 1000, 2) if self.checkouts_total else 0.0,
+            "wait_time_max_ms": round(self.wait_time_max * 1000, 2)
+        }
+
+
+def _timed_pool(pool_class, metrics: PoolMetrics):
+    """Subclass a queue pool so every connect() records how long it waited for a connection"""
+    class TimedPool(pool_class):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                connection = super().connect()
+            except sa_exc.TimeoutError:
+                metrics.timeouts_total += 1
+                raise
+            metrics.record_wait(time.perf_counter() - start)
+            return connection
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run alongside a writer; busy_timeout makes writers wait instead of failing"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.db_sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.db_sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.db_sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.db_sqlite_mmap_size)}")
+    cursor.close()
+
+
+def engine_options(url: str, is_async: bool, metrics: PoolMetrics) -> Dict[str, Any]:
+    """Per-backend engine profile: a sized queue pool for Postgres and file-based SQLite"""
+    parsed = make_url(url)
+    pool_class = AsyncAdaptedQueuePool if is_async else QueuePool
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        return {
+            "poolclass": _timed_pool(pool_class, metrics),
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping
+        }
+    if backend == "sqlite" and parsed.database not in (None, "", ":memory:"):
+        return {
+            "poolclass": _timed_pool(pool_class, metrics),
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow
+        }
+    # In-memory SQLite keeps SQLAlchemy's single-connection pool
+    return {}
+
+
+def create_db_engine(url: str, is_async: bool):
+    """Create an engine with the backend profile, SQLite pragmas and pool metrics applied"""
+    metrics = PoolMetrics()
+    options = engine_options(url, is_async, metrics)
+    engine = (create_async_engine if is_async else create_engine)(url, **options)
+    sync_engine = engine.sync_engine if is_async else engine
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+    metrics.listen(sync_engine)
+    sync_engine.pool_metrics = metrics
+    return engine
+
+
+def get_pool_stats(engine) -> Dict[str, Any]:
+    """Pool occupancy and checkout wait metrics for an engine (sync or async)"""
+    sync_engine: Engine = getattr(engine, "sync_engine", engine)
+    pool = sync_engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.db_max_overflow
+        })
+    stats.update(sync_engine.pool_metrics.get_stats())
+    return stats
+
+
+# Sync engine: migrations, scripts and table creation
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL, is_async=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: request handlers and background workers, so DB round-trips
+# never block the event loop
+async_engine = create_db_engine(settings.async_database_url or to_async_url(SQLALCHEMY_DATABASE_URL), is_async=True)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -17,6 +160,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
@@ -1,27 +1,47 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy import inspect
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+import uuid
 
 from app.config import settings
-from app.database import engine, Base
-from app.routes.case_routes import router as case_router
+from app.logging_config import request_id_var, setup_logging, shutdown_logging
+from app.responses import CompressionMiddleware, default_response_class, upstream_unavailable_handler
+from app.database import engine, async_engine, Base, get_pool_stats
+from app.routes.case_routes import router as case_router, case_job_queue
 from app.auth.routes import router as auth_router
+from app.services.llm import get_llm_provider
+from app.services.llm_cache import llm_cache
+from app.services.resilience import UpstreamUnavailableError
+from app.services.case_service import get_processing_case_ids
+from app.models.schema_check import find_index_drift
 
-logging.basicConfig(level=logging.DEBUG)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create database tables, unless Alembic manages the schema of this database;
+# creating new tables here would make their migrations fail
+if not inspect(engine).has_table("alembic_version"):
+    Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="EmpowerLex API",
     description="Legal Aid Platform API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=default_response_class()
 )
 
+if settings.response_compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.response_compression_min_size,
+        gzip_level=settings.response_gzip_level,
+        brotli_quality=settings.response_brotli_quality
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,8 +49,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination and caching headers that browser clients need to read
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "ETag", "X-Request-ID"],
 )
 
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Tag every log line written while handling a request with its ID"""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+# Bind the LLM provider's connection pool and case workers to the app lifecycle
+@app.on_event("startup")
+async def startup_event():
+    async with async_engine.connect() as conn:
+        drift = await conn.run_sync(find_index_drift)
+    if drift:
+        logger.warning("Database indexes differ from the models; run `alembic upgrade head`", extra={"index_drift": drift})
+    await get_llm_provider().startup()
+    await case_job_queue.start(recovered_job_ids=await get_processing_case_ids())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await case_job_queue.stop()
+    await get_llm_provider().shutdown()
+    llm_cache.close()
+    await async_engine.dispose()
+    shutdown_logging()
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(case_router)
@@ -50,6 +102,8 @@ async def sqlalchemy_exception_handler(request, exc):
         content={"detail": "Database error occurred"}
     )
 
+app.add_exception_handler(UpstreamUnavailableError, upstream_unavailable_handler)
+
 @app.get("/")
 async def root():
     return {
@@ -61,3 +115,15 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "llm_provider": get_llm_provider().get_stats(),
+        "llm_cache": llm_cache.get_stats(),
+        "case_jobs": case_job_queue.get_stats(),
+        "database": {
+            "sync": get_pool_stats(engine),
+            "async": get_pool_stats(async_engine)
+        }
+    }
@@ -1,5 +1,7 @@
 from .user import User
 from .case import Case
 from .feedback import Feedback
+from .case_tombstone import CaseTombstone
+from . import case_search  # noqa: F401  (search index DDL on the cases table)
 
-__all__ = ["User", "Case", "Feedback"] 
\ No newline at end of file
+__all__ = ["User", "Case", "Feedback", "CaseTombstone"] 
\ No newline at end of file
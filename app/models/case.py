@@ -1,13 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+import uuid
+from typing import Optional
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.types import JSONList, clock_now, new_uuid
 
 class Case(Base):
     __tablename__ = "cases"
 
     id = Column(Integer, primary_key=True, index=True)
-    case_id = Column(String, unique=True, index=True)
+    case_id = Column(
+        String, unique=True, index=True, nullable=False,
+        default=lambda: str(uuid.uuid4()), server_default=new_uuid()
+    )
     title = Column(String, index=True)
     description = Column(Text)
     category = Column(String)
@@ -15,12 +22,41 @@ class Case(Base):
     status = Column(String, default="pending")
     user_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert too, so GET /cases/changes can follow every write by updated_at.
+    # clock_now rather than now(): the stamp must not predate a commit by more
+    # than the sync settle window
+    updated_at = Column(DateTime(timezone=True), default=clock_now(), onupdate=clock_now())
     generated_draft = Column(Text)
-    applicable_laws = Column(JSON)
-    suggested_ngos = Column(JSON)
-    next_steps = Column(JSON)
+    applicable_laws = Column(JSONList)
+    suggested_ngos = Column(JSONList)
+    next_steps = Column(JSONList)
+    # Feedback aggregates, kept current by create_feedback so listings never
+    # touch the feedback table
+    feedback_count = Column(Integer, nullable=False, default=0, server_default="0")
+    feedback_rating_total = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     user = relationship("User", back_populates="cases")
-    feedback = relationship("Feedback", back_populates="case", cascade="all, delete-orphan") 
\ No newline at end of file
+    # Never lazy-loaded: callers that need feedback ask for selectinload(Case.feedback)
+    feedback = relationship(
+        "Feedback", back_populates="case", cascade="all, delete-orphan", order_by="Feedback.id", lazy="raise_on_sql"
+    )
+
+    @property
+    def average_rating(self) -> Optional[float]:
+        if not self.feedback_count:
+            return None
+        return round(self.feedback_rating_total / self.feedback_count, 2)
+
+    __table_args__ = (
+        # Keyset pagination of a user's cases by (created_at, id)
+        Index("ix_cases_user_created_id", "user_id", "created_at", "id"),
+        # Filtered listings and per-user counts: equality on status/category,
+        # then the same (created_at, id) order as pagination
+        Index("idx_case_user_status_created", "user_id", "status", "created_at", "id"),
+        Index("idx_case_user_category_created", "user_id", "category", "created_at", "id"),
+        # Delta sync walks a user's writes in (updated_at, id) order
+        Index("idx_case_user_updated", "user_id", "updated_at", "id"),
+        # Startup recovery of cases left in "processing"
+        Index("idx_case_status", "status"),
+    ) 
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 
 class CaseBase(BaseModel):
@@ -11,6 +11,23 @@ class CaseBase(BaseModel):
 class CaseCreate(CaseBase):
     pass
 
+class NextStep(BaseModel):
+    step: str
+    actions: List[str] = []
+    timeline: Optional[str] = None
+
+class LawReference(BaseModel):
+    act: str
+    section: Optional[str] = None
+    relevance: Optional[str] = None
+
+class LegalAnalysisResult(BaseModel):
+    laws: List[LawReference] = []
+    grounds: List[str] = []
+    steps: List[NextStep] = []
+    timeline: Optional[str] = None
+    challenges: List[str] = []
+
 class FeedbackCreate(BaseModel):
     case_id: str
     rating: int  # 1-5
@@ -31,13 +48,64 @@ class CaseResponse(CaseBase):
     generated_draft: Optional[str] = None
     applicable_laws: Optional[List[Dict[str, Any]]] = None
     suggested_ngos: Optional[List[Dict[str, Any]]] = None
-    next_steps: Optional[List[str]] = None
+    next_steps: Optional[List[Union[NextStep, str]]] = None
     feedback: Optional[List[FeedbackResponse]] = None
+    feedback_count: int = 0
+    average_rating: Optional[float] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class CaseSummary(CaseBase):
+    """Listing view of a case; drafts and JSON fields come from GET /cases/{case_id}"""
+    id: int
+    case_id: str
+    status: str
+    feedback_count: int = 0
+    average_rating: Optional[float] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     model_config = ConfigDict(from_attributes=True)
 
+class CaseSearchResult(CaseSummary):
+    """A search hit; matched terms in the highlights are wrapped in <mark></mark>"""
+    score: float
+    title_highlight: str
+    snippet: str
+
+class CaseChanges(BaseModel):
+    """Delta since a sync token: upserts by case_id, then deletions"""
+    changed: List[CaseSummary]
+    deleted: List[str]
+    next_token: str
+    has_more: bool
+
+class CaseCounts(BaseModel):
+    """Dashboard totals for the current user's cases"""
+    total: int
+    by_status: Dict[str, int]
+    by_category: Dict[str, int]
+
+class CaseJobResponse(BaseModel):
+    case_id: str
+    status: str
+
+class BatchCaseCreate(BaseModel):
+    cases: List[CaseCreate] = Field(..., min_length=1)
+
+class BatchCaseItemResult(BaseModel):
+    index: int
+    status: str  # "created" or "error"
+    case_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchCaseResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchCaseItemResult]
+
 class CaseUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -58,5 +126,5 @@ class GenerateCaseResponse(BaseModel):
     draft: str
     applicable_laws: List[Dict[str, Any]]
     suggested_ngos: List[Dict[str, Any]]
-    next_steps: List[str]
+    next_steps: List[Union[NextStep, str]]
     estimated_timeline: Optional[str] = None
@@ -0,0 +1,65 @@
+"""Full-text search index over a case's title, description and generated draft.
+
+SQLite keeps an external-content FTS5 table, ``cases_fts``, in step with
+``cases`` through triggers. Postgres uses a GIN index on the tsvector
+expression itself, so it is maintained by the database without triggers.
+"""
+from sqlalchemy import DDL, Index, event, func, literal
+
+from app.models.case import Case
+
+SEARCH_CONFIG = "english"
+
+SQLITE_FTS_TABLE = "cases_fts"
+
+SQLITE_FTS_CREATE = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, description, generated_draft,
+        content='cases', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS cases_fts_ai AFTER INSERT ON cases BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, description, generated_draft)
+        VALUES (new.id, new.title, new.description, new.generated_draft);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS cases_fts_ad AFTER DELETE ON cases BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}, rowid, title, description, generated_draft)
+        VALUES ('delete', old.id, old.title, old.description, old.generated_draft);
+    END""",
+    # Status and feedback updates do not touch the indexed text, so they skip the index
+    f"""CREATE TRIGGER IF NOT EXISTS cases_fts_au AFTER UPDATE OF title, description, generated_draft ON cases BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}, rowid, title, description, generated_draft)
+        VALUES ('delete', old.id, old.title, old.description, old.generated_draft);
+        INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, description, generated_draft)
+        VALUES (new.id, new.title, new.description, new.generated_draft);
+    END""",
+]
+
+SQLITE_FTS_REBUILD = f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}) VALUES ('rebuild')"
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS cases_fts_au",
+    "DROP TRIGGER IF EXISTS cases_fts_ad",
+    "DROP TRIGGER IF EXISTS cases_fts_ai",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+def _weighted(column, weight: str):
+    # Constants are rendered inline so query expressions match the index text
+    return func.setweight(
+        func.to_tsvector(literal(SEARCH_CONFIG, literal_execute=True), func.coalesce(column, literal("", literal_execute=True))),
+        literal(weight, literal_execute=True)
+    )
+
+# Title matches outrank description matches, which outrank draft matches.
+# Queries must use this exact expression for Postgres to pick the index.
+_cases = Case.__table__
+search_document = (
+    _weighted(_cases.c.title, "A")
+    .op("||")(_weighted(_cases.c.description, "B"))
+    .op("||")(_weighted(_cases.c.generated_draft, "C"))
+)
+
+search_index = Index("idx_cases_search", search_document, postgresql_using="gin").ddl_if(dialect="postgresql")
+
+for _statement in SQLITE_FTS_CREATE:
+    event.listen(_cases, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
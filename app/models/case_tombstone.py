@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, event, insert
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.case import Case
+
+class CaseTombstone(Base):
+    """Record of a deleted case, so delta sync can tell clients to drop it"""
+    __tablename__ = "case_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    case_id = Column(String, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # GET /cases/changes walks a user's deletions in (deleted_at, id) order
+        Index("idx_case_tombstone_user_deleted", "user_id", "deleted_at", "id"),
+    )
+
+@event.listens_for(Case, "after_delete")
+def _record_tombstone(mapper, connection, target):
+    connection.execute(insert(CaseTombstone.__table__).values(case_id=target.case_id, user_id=target.user_id))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -16,4 +16,9 @@ class Feedback(Base):
 
     # Relationships
     user = relationship("User", back_populates="feedback")
-    case = relationship("Case", back_populates="feedback") 
\ No newline at end of file
+    case = relationship("Case", back_populates="feedback") 
+
+    __table_args__ = (
+        # Feedback fetched and aggregated per case
+        Index("idx_feedback_case_rating", "case_id", "rating"),
+    )
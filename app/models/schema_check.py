@@ -0,0 +1,59 @@
+"""Compare the indexes declared on the models with the ones deployed in the database."""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, inspect
+from sqlalchemy.engine import Connection
+
+from app.database import Base
+from app import models  # noqa: F401  (registers every table on Base.metadata)
+
+# Column names in index order (None for an expression) and uniqueness
+IndexShape = Tuple[Tuple[Optional[str], ...], bool]
+
+def _created_on(index, dialect_name: str) -> bool:
+    """False for indexes restricted with .ddl_if() to other dialects"""
+    ddl_if = index._ddl_if
+    if ddl_if is None or ddl_if.dialect is None:
+        return True
+    dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+    return dialect_name in dialects
+
+def _declared_indexes(table, dialect_name: str) -> Dict[str, IndexShape]:
+    return {
+        index.name: (
+            tuple(expr.name if isinstance(expr, Column) else None for expr in index.expressions),
+            bool(index.unique)
+        )
+        for index in table.indexes
+        if _created_on(index, dialect_name)
+    }
+
+def _deployed_indexes(inspector, table_name: str) -> Dict[str, IndexShape]:
+    return {
+        index["name"]: (tuple(index["column_names"]), bool(index["unique"]))
+        for index in inspector.get_indexes(table_name)
+        # Indexes backing a UNIQUE constraint are reported separately on Postgres
+        if not index.get("duplicates_constraint")
+    }
+
+def find_index_drift(connection: Connection) -> List[str]:
+    """Describe every index that differs between the models and the live schema.
+
+    An empty list means the deployed schema carries exactly the declared indexes.
+    """
+    inspector = inspect(connection)
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"{table.name}: table missing")
+            continue
+        declared = _declared_indexes(table, connection.dialect.name)
+        deployed = _deployed_indexes(inspector, table.name)
+        for name, shape in declared.items():
+            if name not in deployed:
+                problems.append(f"{table.name}.{name}: declared but not deployed")
+            elif deployed[name] != shape:
+                problems.append(f"{table.name}.{name}: deployed as {deployed[name]}, declared as {shape}")
+        for name in sorted(deployed.keys() - declared.keys()):
+            problems.append(f"{table.name}.{name}: deployed but not declared")
+    return problems
@@ -0,0 +1,78 @@
+from typing import Any, List, Optional
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+
+class JSONList(TypeDecorator):
+    """JSON array column, stored natively (JSONB on Postgres) and read back as a list.
+
+    Values must be Python lists; pre-encoded JSON strings are rejected so the
+    column can never be double-encoded again.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[List[Any]]:
+        if value is None:
+            return None
+        if isinstance(value, tuple):
+            return list(value)
+        if not isinstance(value, list):
+            raise TypeError(f"JSONList columns take a list, got {type(value).__name__}")
+        return value
+
+    def process_result_value(self, value: Any, dialect) -> List[Any]:
+        return value if value is not None else []
+
+
+class new_uuid(FunctionElement):
+    """Server-side random UUID string, for column defaults written outside the ORM"""
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(new_uuid)
+def _new_uuid_default(element, compiler, **kw):
+    return "gen_random_uuid()::text"
+
+
+@compiles(new_uuid, "sqlite")
+def _new_uuid_sqlite(element, compiler, **kw):
+    # SQLite has no UUID function; assemble a version-4 UUID from random bytes
+    return (
+        "(lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+        "substr(lower(hex(randomblob(2))), 2) || '-' || "
+        "substr('89ab', 1 + (abs(random()) % 4), 1) || substr(lower(hex(randomblob(2))), 2) || '-' || "
+        "lower(hex(randomblob(6))))"
+    )
+
+
+class clock_now(FunctionElement):
+    """Current wall-clock time, even late in a long transaction.
+
+    Postgres' now() is frozen at the start of the transaction, so a row written
+    after a slow step would be stamped with a time from before that step.
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(clock_now)
+def _clock_now_default(element, compiler, **kw):
+    return "clock_timestamp()"
+
+
+@compiles(clock_now, "sqlite")
+def _clock_now_sqlite(element, compiler, **kw):
+    # Evaluated per statement on SQLite, so it is already wall-clock time
+    return "CURRENT_TIMESTAMP"
@@ -0,0 +1,131 @@
+"""Response encoding: the app-wide JSON response class, body compression and
+the 503 response sent while the AI upstream is unavailable.
+
+orjson and Brotli are optional; without them responses fall back to the
+standard library JSON encoder and gzip.
+"""
+import logging
+from typing import Set, Type
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .services.resilience import UpstreamUnavailableError
+
+try:
+    import orjson  # noqa: F401
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Server-Sent Events must reach the client as each event is written;
+# a compressor would hold them back until its buffer fills
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+
+# Set on responses the compressors must skip (they leave any response that
+# already has a Content-Encoding alone) and removed again before sending
+_SKIP_ENCODING = "identity"
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Content codings named in an Accept-Encoding header with a non-zero q-value"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+def default_response_class() -> Type[JSONResponse]:
+    """ORJSONResponse when enabled and installed, else the standard JSONResponse"""
+    if settings.fast_json_responses and not ORJSON_AVAILABLE:
+        logger.warning("fast_json_responses is set but orjson is not installed; using JSONResponse")
+    if settings.fast_json_responses and ORJSON_AVAILABLE:
+        return ORJSONResponse
+    return JSONResponse
+
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailableError) -> JSONResponse:
+    """503 with a Retry-After hint for requests the LLM provider could not serve"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "AI service temporarily unavailable, please retry shortly"},
+        headers={"Retry-After": str(int(exc.retry_after) + 1)}
+    )
+
+class CompressionMiddleware:
+    """Brotli for clients that accept it, gzip otherwise; small bodies and event streams are sent as-is.
+
+    A compressed body is a different representation from the identity one,
+    so a strong ETag on it is weakened (W/"...") rather than shared.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        self.app = app
+        self.gzip_app = GZipMiddleware(self._mark_uncompressed, minimum_size=minimum_size, compresslevel=gzip_level)
+        self.brotli_app = (
+            BrotliMiddleware(
+                self._mark_uncompressed, quality=brotli_quality, minimum_size=minimum_size, gzip_fallback=False
+            )
+            if BROTLI_AVAILABLE else None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if self.brotli_app is not None and "br" in accepted:
+            compressor = self.brotli_app
+        elif "gzip" in accepted:
+            compressor = self.gzip_app
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_encoded(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                encoding = headers.get("content-encoding")
+                if encoding == _SKIP_ENCODING:
+                    del headers["content-encoding"]
+                elif encoding and headers.get("etag", "").startswith('"'):
+                    headers["etag"] = "W/" + headers["etag"]
+            await send(message)
+
+        await compressor(scope, receive, send_encoded)
+
+    async def _mark_uncompressed(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_marked(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+                if media_type in UNCOMPRESSED_MEDIA_TYPES and "content-encoding" not in headers:
+                    headers["content-encoding"] = _SKIP_ENCODING
+            await send(message)
+
+        await self.app(scope, receive, send_marked)
@@ -1,14 +1,26 @@
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Literal, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse, JSONResponse
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
 import logging
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+import hashlib
 import json
 import uuid
 
 from ..models.case_schema import (
     CaseCreate,
     CaseResponse,
+    CaseSummary,
+    CaseSearchResult,
+    CaseChanges,
+    CaseCounts,
+    CaseJobResponse,
+    BatchCaseCreate,
+    BatchCaseResponse,
     GenerateCaseRequest,
     GenerateCaseResponse,
     FeedbackCreate,
@@ -18,10 +30,16 @@ from ..models.user_schema import UserResponse
 from app.models.case import Case
 from app.models.feedback import Feedback
 from ..auth.dependencies import get_current_active_user
-from ..database import get_db
+from ..database import get_async_db
 from ..agent.legal_agent import LegalAgent
 from ..config import settings
 from app.agent.tools.ngo_finder import NGOFinderTool
+from app.services.resilience import UpstreamUnavailableError
+from app.services.case_jobs import CaseJobQueue, InProcessJobBackend, JobQueueFullError
+from app.services.case_service import apply_agent_response, process_case_job, process_case_batch
+from app.services.pagination import InvalidCursorError, keyset_page, timestamp_param
+from app.services.search import search_cases
+from app.services.sync import case_changes
 
 router = APIRouter(prefix="/cases", tags=["cases"])
 
@@ -31,18 +49,121 @@ legal_agent = LegalAgent(openai_api_key=settings.openai_api_key)
 # Initialize NGO finder tool
 ngo_finder = NGOFinderTool()
 
+# Background worker pool for cases submitted with ?background=true
+case_job_queue = CaseJobQueue(
+    handler=lambda case_id: process_case_job(case_id, legal_agent),
+    backend=InProcessJobBackend(maxsize=settings.case_job_queue_size),
+    workers=settings.case_job_workers
+)
+
 logger = logging.getLogger(__name__)
 
 class ChatRequest(BaseModel):
     message: str
 
-@router.post("/", response_model=CaseResponse)
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+def _json_with_etag(request: Request, body: bytes, headers: Optional[dict] = None) -> Response:
+    """Send a JSON body with a strong ETag, or 304 when the client already has it"""
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+CASE_SUMMARY_LIST = TypeAdapter(List[CaseSummary])
+
+# Columns shown on dashboard cards; drafts and JSON fields are never fetched for listings
+CASE_SUMMARY_COLUMNS = load_only(
+    Case.id,
+    Case.case_id,
+    Case.title,
+    Case.description,
+    Case.category,
+    Case.status,
+    Case.feedback_count,
+    Case.feedback_rating_total,
+    Case.created_at,
+    Case.updated_at,
+    raiseload=True
+)
+
+# Relationships serialized with a full case; Case.feedback raises if it was not loaded here
+CASE_DETAIL_OPTIONS = selectinload(Case.feedback)
+
+async def _get_user_case(db: AsyncSession, case_id: str, user_id: int, *options) -> Optional[Case]:
+    """Fetch one of the user's cases by case_id, reloading any attributes already in the session"""
+    result = await db.execute(
+        select(Case)
+        .options(*options)
+        .where(Case.case_id == case_id, Case.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+class CaseFilters:
+    """Query parameters narrowing the current user's cases.
+    
+    created_after is inclusive and created_before exclusive.
+    """
+
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ):
+        self.status = status
+        self.category = category
+        self.created_after = created_after
+        self.created_before = created_before
+
+    def apply(self, query, dialect_name: str):
+        if self.status:
+            query = query.where(Case.status == self.status)
+        if self.category:
+            query = query.where(Case.category == self.category)
+        if self.created_after:
+            query = query.where(Case.created_at >= timestamp_param(self.created_after, dialect_name))
+        if self.created_before:
+            query = query.where(Case.created_at < timestamp_param(self.created_before, dialect_name))
+        return query
+
+@router.post(
+    "/",
+    response_model=CaseResponse,
+    responses={202: {"model": CaseJobResponse}}
+)
 async def create_case(
     case: CaseCreate,
+    background: bool = False,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Create a new legal case"""
+    """Create a new legal case.
+    
+    With ?background=true the case is stored immediately with status 'processing'
+    and 202 Accepted is returned; poll GET /cases/{case_id}/status for completion.
+    """
+    if background:
+        return await _enqueue_case(case, current_user, db)
     try:
         # Process case through legal agent
         agent_response = await legal_agent.process_case(
@@ -52,13 +173,6 @@ async def create_case(
             location=current_user.location
         )
         
-        # Ensure next_steps is properly awaited and serializable
-        next_steps = agent_response.get("next_steps", [])
-        if isinstance(next_steps, list):
-            next_steps_json = json.dumps(next_steps)
-        else:
-            next_steps_json = json.dumps([str(next_steps)])
-        
         # Create case in database
         case_id = str(uuid.uuid4())
         db_case = Case(
@@ -67,27 +181,78 @@ async def create_case(
             description=case.description,
             category=case.category,
             status="pending",
-            user_id=current_user.id,
-            generated_draft=agent_response["draft"],
-            applicable_laws=json.dumps(agent_response["applicable_laws"]),
-            suggested_ngos=json.dumps(agent_response["suggested_ngos"]),
-            next_steps=next_steps_json
+            user_id=current_user.id
         )
+        apply_agent_response(db_case, agent_response)
         
         db.add(db_case)
-        db.commit()
-        db.refresh(db_case)
-        
-        # Deserialize JSON fields for response
-        db_case.applicable_laws = json.loads(db_case.applicable_laws) if db_case.applicable_laws else []
-        db_case.suggested_ngos = json.loads(db_case.suggested_ngos) if db_case.suggested_ngos else []
-        db_case.next_steps = json.loads(db_case.next_steps) if db_case.next_steps else []
+        await db.commit()
         
-        return db_case
+        return await _get_user_case(db, case_id, current_user.id, CASE_DETAIL_OPTIONS)
+    except UpstreamUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Error creating case: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+async def _enqueue_case(case: CaseCreate, current_user: UserResponse, db: AsyncSession) -> JSONResponse:
+    """Insert the case as 'processing' and hand it to the background workers"""
+    case_id = str(uuid.uuid4())
+    db_case = Case(
+        case_id=case_id,
+        title=case.title,
+        description=case.description,
+        category=case.category,
+        location=current_user.location,
+        status="processing",
+        user_id=current_user.id
+    )
+    db.add(db_case)
+    await db.commit()
+    try:
+        case_job_queue.enqueue(case_id)
+    except JobQueueFullError:
+        # Drop the row so the client's retry does not leave a duplicate behind.
+        # A bulk delete skips the tombstone hook: no client ever saw this case
+        logger.warning(f"Case job queue full, case {case_id} rejected")
+        await db.execute(delete(Case).where(Case.id == db_case.id))
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Case processing queue is full, please retry shortly"
+        )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=CaseJobResponse(case_id=case_id, status="processing").model_dump()
+    )
+
+@router.post("/batch", response_model=BatchCaseResponse)
+async def create_cases_batch(
+    batch: BatchCaseCreate,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many cases at once with bounded parallel processing and a per-item report"""
+    if len(batch.cases) > settings.case_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.case_batch_max_items} cases"
+        )
+    results = await process_case_batch(
+        items=batch.cases,
+        user=current_user,
+        agent=legal_agent,
+        db=db,
+        concurrency=settings.case_batch_concurrency,
+        chunk_size=settings.case_batch_chunk_size
+    )
+    succeeded = sum(1 for result in results if result["status"] == "created")
+    return BatchCaseResponse(
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
 @router.post("/generate", response_model=GenerateCaseResponse)
 async def generate_case(
     request: GenerateCaseRequest,
@@ -111,84 +276,201 @@ async def generate_case(
         next_steps=agent_response["next_steps"]
     )
 
+@router.post("/generate/stream")
+async def generate_case_stream(
+    request: GenerateCaseRequest,
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """Stream case analysis as Server-Sent Events without saving to database"""
+    generated_case_id = str(uuid.uuid4())
+    location = request.location or current_user.location
+    
+    async def event_stream():
+        yield _sse_event("start", {
+            "case_id": generated_case_id,
+            "title": request.title,
+            "category": request.category
+        })
+        try:
+            async for event, data in legal_agent.process_case_stream(
+                title=request.title,
+                description=request.description,
+                category=request.category,
+                location=location
+            ):
+                yield _sse_event(event, data)
+        except Exception as e:
+            logger.error(f"Error streaming case generation: {str(e)}", exc_info=True)
+            yield _sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/search", response_model=List[CaseSearchResult])
+async def search_user_cases(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(settings.cases_page_size, ge=1, le=settings.cases_max_page_size),
+    offset: int = Query(0, ge=0, le=settings.cases_search_max_offset),
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over the current user's case titles, descriptions and drafts.
+    
+    Results are best match first. When more results exist the X-Next-Offset
+    response header holds the value to pass as ?offset= for the next page.
+    """
+    hits, has_more = await search_cases(db, current_user.id, q, limit, offset, CASE_SUMMARY_COLUMNS)
+    if has_more:
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return [
+        CaseSearchResult.model_validate({
+            **CaseSummary.model_validate(hit.case).model_dump(),
+            "score": hit.score,
+            "title_highlight": hit.title_highlight,
+            "snippet": hit.snippet
+        })
+        for hit in hits
+    ]
+
+@router.get("/changes", response_model=CaseChanges)
+async def get_case_changes(
+    since: Optional[str] = None,
+    limit: int = Query(settings.cases_max_page_size, ge=1, le=settings.cases_max_page_size),
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cases created, updated or deleted since a sync token.
+    
+    Omit `since` for a full sync. Store next_token and pass it as ?since= on
+    the next refresh; while has_more is true, call again right away. Changed
+    cases may repeat across syncs and should be upserted by case_id.
+    """
+    try:
+        changes = await case_changes(db, current_user.id, since, limit, CASE_SUMMARY_COLUMNS)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return CaseChanges(
+        changed=CASE_SUMMARY_LIST.validate_python(changes.changed, from_attributes=True),
+        deleted=changes.deleted,
+        next_token=changes.next_token,
+        has_more=changes.has_more
+    )
+
+@router.get("/counts", response_model=CaseCounts)
+async def count_cases(
+    filters: CaseFilters = Depends(),
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Count the current user's cases by status and by category.
+    
+    Legacy rows without a category and cases whose status was cleared are
+    counted under "uncategorized" and "unknown".
+    """
+    dialect_name = db.bind.dialect.name
+    by_status = {}
+    by_category = {}
+    groups = ((Case.status, by_status, "unknown"), (Case.category, by_category, "uncategorized"))
+    for column, counts, missing in groups:
+        query = select(column, func.count()).where(Case.user_id == current_user.id).group_by(column)
+        for key, count in (await db.execute(filters.apply(query, dialect_name))).all():
+            key = missing if key is None else key
+            counts[key] = counts.get(key, 0) + count
+    return CaseCounts(total=sum(by_status.values()), by_status=by_status, by_category=by_category)
+
+@router.get("/{case_id}/status", response_model=CaseJobResponse)
+async def get_case_status(
+    case_id: str,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the processing status of a case"""
+    result = await db.execute(
+        select(Case.case_id, Case.status).where(
+            Case.case_id == case_id,
+            Case.user_id == current_user.id
+        )
+    )
+    row = result.first()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Case not found"
+        )
+    return CaseJobResponse(case_id=row.case_id, status=row.status)
+
 @router.get("/{case_id}", response_model=CaseResponse)
 async def get_case(
     case_id: str,
+    request: Request,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get a specific case by ID"""
-    case = db.query(Case).filter(
-        Case.case_id == case_id,
-        Case.user_id == current_user.id
-    ).first()
+    """Get a specific case by ID, with its feedback.
+    
+    Send the ETag from a previous response as If-None-Match to get an empty
+    304 when the case has not changed.
+    """
+    case = await _get_user_case(db, case_id, current_user.id, CASE_DETAIL_OPTIONS)
     
     if not case:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Case not found"
         )
-    # Ensure case_id is set
-    if not case.case_id:
-        case.case_id = str(uuid.uuid4())
-        db.commit()
-    # Deserialize JSON fields
-    case.applicable_laws = json.loads(case.applicable_laws) if case.applicable_laws else []
-    case.suggested_ngos = json.loads(case.suggested_ngos) if case.suggested_ngos else []
-    case.next_steps = json.loads(case.next_steps) if case.next_steps else []
-    # Get feedback for the case
-    case.feedback = db.query(Feedback).filter(Feedback.case_id == case_id).all()
-    return case
-
-@router.get("/", response_model=List[CaseResponse])
+    return _json_with_etag(request, CaseResponse.model_validate(case).model_dump_json().encode("utf-8"))
+
+@router.delete("/{case_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_case(
+    case_id: str,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a case and its feedback; delta sync reports it under `deleted`"""
+    case = await _get_user_case(db, case_id, current_user.id, CASE_DETAIL_OPTIONS)
+    
+    if not case:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Case not found"
+        )
+    await db.delete(case)
+    await db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get("/", response_model=List[CaseSummary])
 async def list_cases(
+    request: Request,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: Optional[int] = None
+    db: AsyncSession = Depends(get_async_db),
+    filters: CaseFilters = Depends(),
+    sort: Literal["newest", "oldest"] = "newest",
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.cases_page_size, ge=1, le=settings.cases_max_page_size)
 ):
-    """List all cases for the current user"""
+    """List summaries of the current user's cases, one page at a time.
+    
+    Cases can be narrowed by status, category and a created_at range, and
+    sorted newest or oldest first. Full case detail is served by
+    GET /cases/{case_id}. When more cases exist the X-Next-Cursor response
+    header holds the token to pass as ?cursor= (with the same filters) for
+    the next page. Pages carry an ETag; an unchanged page answers
+    If-None-Match with an empty 304.
+    """
     try:
-        query = db.query(Case).filter(Case.user_id == current_user.id)
-        if limit is not None:
-            query = query.offset(skip).limit(limit)
-        cases = query.all()
-        
-        # Deserialize JSON fields for each case
-        for case in cases:
-            # Ensure case_id is set
-            if not case.case_id:
-                case.case_id = str(uuid.uuid4())
-                db.commit()
-            
-            # Deserialize JSON fields
-            case.applicable_laws = json.loads(case.applicable_laws) if case.applicable_laws else []
-            case.suggested_ngos = json.loads(case.suggested_ngos) if case.suggested_ngos else []
-            
-            # Handle next_steps - ensure it's a list of strings
-            if case.next_steps:
-                try:
-                    next_steps = json.loads(case.next_steps)
-                    if isinstance(next_steps, list):
-                        # If it's a list of objects, extract the step and actions
-                        formatted_steps = []
-                        for step in next_steps:
-                            if isinstance(step, dict):
-                                if 'step' in step:
-                                    formatted_steps.append(step['step'])
-                                if 'actions' in step and isinstance(step['actions'], list):
-                                    formatted_steps.extend(step['actions'])
-                            elif isinstance(step, str):
-                                formatted_steps.append(step)
-                        case.next_steps = formatted_steps
-                    else:
-                        case.next_steps = []
-                except json.JSONDecodeError:
-                    case.next_steps = []
-            else:
-                case.next_steps = []
-        
-        return cases
+        query = select(Case).options(CASE_SUMMARY_COLUMNS).where(Case.user_id == current_user.id)
+        query = filters.apply(query, db.bind.dialect.name)
+        try:
+            cases, next_cursor = await keyset_page(
+                db, query, Case.created_at, Case.id, cursor, limit, descending=(sort == "newest")
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        body = CASE_SUMMARY_LIST.dump_json(CASE_SUMMARY_LIST.validate_python(cases, from_attributes=True))
+        return _json_with_etag(request, body, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing cases: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -201,13 +483,10 @@ async def create_feedback(
     case_id: str,
     feedback: FeedbackCreate,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create feedback for a case"""
-    case = db.query(Case).filter(
-        Case.case_id == case_id,
-        Case.user_id == current_user.id
-    ).first()
+    case = await _get_user_case(db, case_id, current_user.id)
     
     if not case:
         raise HTTPException(
@@ -223,8 +502,17 @@ async def create_feedback(
     )
     
     db.add(db_feedback)
-    db.commit()
-    db.refresh(db_feedback)
+    # Bump the aggregates in SQL so concurrent feedback on one case cannot lose updates
+    await db.execute(
+        update(Case)
+        .where(Case.id == case.id)
+        .values(
+            feedback_count=Case.feedback_count + 1,
+            feedback_rating_total=Case.feedback_rating_total + feedback.rating
+        )
+    )
+    await db.commit()
+    await db.refresh(db_feedback)
     
     return db_feedback
 
@@ -237,18 +525,32 @@ async def chat_with_agent(
     response = await legal_agent.chat(request.message)
     return {"response": response} 
 
+@router.post("/chat/stream")
+async def chat_with_agent_stream(
+    request: ChatRequest,
+    current_user: UserResponse = Depends(get_current_active_user)
+):
+    """Chat with the legal agent, streaming the reply as Server-Sent Events"""
+    async def event_stream():
+        try:
+            async for chunk in legal_agent.chat_stream(request.message):
+                yield _sse_event("chunk", {"text": chunk})
+            yield _sse_event("done", {})
+        except Exception as e:
+            logger.error(f"Error streaming chat response: {str(e)}", exc_info=True)
+            yield _sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.patch("/{case_id}", response_model=CaseResponse)
 async def update_case_status(
     case_id: str,
     status_update: dict,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update case status"""
-    case = db.query(Case).filter(
-        Case.case_id == case_id,
-        Case.user_id == current_user.id
-    ).first()
+    case = await _get_user_case(db, case_id, current_user.id)
     
     if not case:
         raise HTTPException(
@@ -258,29 +560,20 @@ async def update_case_status(
     
     # Update status
     case.status = status_update.get("status", case.status)
-    db.commit()
-    db.refresh(case)
-    
-    # Deserialize JSON fields
-    case.applicable_laws = json.loads(case.applicable_laws) if case.applicable_laws else []
-    case.suggested_ngos = json.loads(case.suggested_ngos) if case.suggested_ngos else []
-    case.next_steps = json.loads(case.next_steps) if case.next_steps else []
+    await db.commit()
     
-    return case
+    return await _get_user_case(db, case_id, current_user.id, CASE_DETAIL_OPTIONS)
 
 # Next steps endpoints
 @router.get("/{case_id}/next-steps")
 async def get_next_steps(
     case_id: str,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get next steps for a case"""
     try:
-        case = db.query(Case).filter(
-            Case.case_id == case_id,
-            Case.user_id == current_user.id
-        ).first()
+        case = await _get_user_case(db, case_id, current_user.id)
         
         if not case:
             raise HTTPException(
@@ -288,19 +581,8 @@ async def get_next_steps(
                 detail="Case not found"
             )
         
-        # Handle None or empty next_steps
-        if not case.next_steps:
-            return {"steps": []}
+        return {"steps": case.next_steps}
         
-        try:
-            next_steps = json.loads(case.next_steps)
-            if not isinstance(next_steps, list):
-                next_steps = []
-            return {"steps": next_steps}
-        except json.JSONDecodeError:
-            logger.error(f"Error decoding next steps for case {case_id}")
-            return {"steps": []}
-            
     except Exception as e:
         logger.error(f"Error getting next steps: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -313,14 +595,11 @@ async def update_next_steps(
     case_id: str,
     steps_update: dict,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update next steps for a case"""
     try:
-        case = db.query(Case).filter(
-            Case.case_id == case_id,
-            Case.user_id == current_user.id
-        ).first()
+        case = await _get_user_case(db, case_id, current_user.id)
         
         if not case:
             raise HTTPException(
@@ -337,16 +616,11 @@ async def update_next_steps(
             )
         
         # Update next steps
-        case.next_steps = json.dumps(steps)
-        db.commit()
-        db.refresh(case)
+        case.next_steps = steps
+        await db.commit()
+        
+        return {"steps": case.next_steps}
         
-        # Return updated steps
-        try:
-            return {"steps": json.loads(case.next_steps)}
-        except json.JSONDecodeError:
-            return {"steps": []}
-            
     except HTTPException:
         raise
     except Exception as e:
@@ -363,7 +637,7 @@ async def search_ngos(
     category: Optional[str] = None,
     location: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search NGOs by query, category, and/or location"""
     # Get all NGOs from the mock database
@@ -425,7 +699,7 @@ async def get_ngos_by_category(
     category: str,
     location: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get NGOs by category and optionally by location"""
     # Map frontend categories to backend categories
@@ -468,7 +742,7 @@ async def get_ngos_by_location(
     location: str,
     category: Optional[str] = None,
     current_user: UserResponse = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get NGOs by location and optionally by category"""
     # Get all NGOs from the mock database
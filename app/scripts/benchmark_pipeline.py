@@ -0,0 +1,85 @@
+"""Benchmark LegalAgent.process_case offline against the fake LLM provider.
+
+Usage:
+    python -m app.scripts.benchmark_pipeline --cases 200 --concurrency 20 --latency-mean 0.8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.agent.legal_agent import LegalAgent
+from app.services.llm import set_llm_provider
+from app.services.llm_cache import llm_cache
+from app.services.llm_providers import FakeLLMService
+from app.services.resilience import UpstreamUnavailableError
+
+CATEGORIES = ["Consumer Protection", "Labour Law", "Family Law", "Criminal Law", "Property Law"]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def run(args):
+    provider = FakeLLMService(
+        latency_distribution=args.latency_distribution,
+        latency_mean=args.latency_mean,
+        latency_stddev=args.latency_stddev,
+        error_rate=args.error_rate,
+        response_words=args.response_words,
+        seed=args.seed
+    )
+    set_llm_provider(provider)
+    llm_cache.enabled = args.cache
+    agent = LegalAgent()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(index):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await agent.process_case(
+                    title=f"Benchmark case {index}",
+                    description=f"Synthetic case description number {index} for load testing.",
+                    category=CATEGORIES[index % len(CATEGORIES)],
+                    location="Mumbai"
+                )
+            except UpstreamUnavailableError:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(args.cases)))
+    elapsed = time.perf_counter() - start
+
+    print(f"cases={args.cases} concurrency={args.concurrency} provider_calls={provider.calls} failures={failures}")
+    print(f"wall={elapsed:.2f}s throughput={args.cases / elapsed:.1f} cases/s")
+    if not latencies:
+        return
+    print(
+        f"latency mean={statistics.mean(latencies) * 1000:.0f}ms "
+        f"p50={percentile(latencies, 50) * 1000:.0f}ms "
+        f"p95={percentile(latencies, 95) * 1000:.0f}ms "
+        f"p99={percentile(latencies, 99) * 1000:.0f}ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-distribution", default="lognormal", choices=FakeLLMService.LATENCY_DISTRIBUTIONS)
+    parser.add_argument("--latency-mean", type=float, default=1.0)
+    parser.add_argument("--latency-stddev", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--response-words", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cache", action="store_true", help="Enable the LLM response cache")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark JSON encoding and compressed size of case responses.
+
+Compares the encoders a response can go through (FastAPI's default
+JSONResponse, ORJSONResponse, and pydantic's dump_json used by the ETag
+paths) and the bytes on the wire with gzip and Brotli, for GET /cases/
+pages (summaries) and for full cases with drafts.
+
+Usage:
+    python -m app.scripts.benchmark_responses --sizes 10 100 1000 --repeat 20
+"""
+import argparse
+import gzip
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.models.case_schema import CaseResponse, CaseSummary
+from app.responses import BROTLI_AVAILABLE, ORJSON_AVAILABLE
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+CATEGORIES = ["Consumer Protection", "Labour Law", "Family Law", "Criminal Law", "Property Law"]
+WORDS = "the tenant landlord deposit notice court wages employer refund complaint act section relief".split()
+
+def _text(index: int, words: int) -> str:
+    return " ".join(WORDS[(index * 7 + i) % len(WORDS)] for i in range(words))
+
+def make_cases(count: int) -> List[dict]:
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "id": index,
+            "case_id": f"00000000-0000-4000-8000-{index:012d}",
+            "title": f"Case {index}: {_text(index, 6)}",
+            "description": _text(index, 60),
+            "category": CATEGORIES[index % len(CATEGORIES)],
+            "status": "pending",
+            "feedback_count": index % 4,
+            "average_rating": 4.0 if index % 4 else None,
+            "created_at": start + timedelta(minutes=index),
+            "updated_at": start + timedelta(minutes=index, seconds=30),
+            "generated_draft": _text(index, 900),
+            "applicable_laws": [{"name": "Consumer Protection Act, 2019", "section": "35", "relevance": _text(index, 20)}],
+            "suggested_ngos": [{"name": "Legal Aid Society", "contact": "+91-22-0000-0000", "location": "Mumbai"}],
+            "next_steps": [{"step": _text(index, 5), "actions": [_text(index, 10)], "timeline": "2 weeks"}],
+            "feedback": []
+        }
+        for index in range(count)
+    ]
+
+def _timed(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - start)
+    return body, statistics.median(timings) * 1000
+
+def run(args):
+    print(f"orjson={'yes' if ORJSON_AVAILABLE else 'no'} brotli={'yes' if BROTLI_AVAILABLE else 'no'} "
+          f"gzip_level={args.gzip_level} brotli_quality={args.brotli_quality}")
+    for label, model in (("summaries", CaseSummary), ("full cases", CaseResponse)):
+        adapter = TypeAdapter(List[model])
+        print(f"\n{label}")
+        print(f"{'cases':>6} {'encoder':>9} {'encode ms':>10} {'raw bytes':>10} {'gzip':>9} {'gzip ms':>8} {'br':>9} {'br ms':>7}")
+        for size in args.sizes:
+            models = adapter.validate_python(make_cases(size))
+            # What FastAPI does for a response_model route: serialize to JSON-ready
+            # Python with pydantic, then render with the response class
+            encoders = {"json": lambda: JSONResponse(adapter.dump_python(models, mode="json")).body}
+            if ORJSON_AVAILABLE:
+                encoders["orjson"] = lambda: ORJSONResponse(adapter.dump_python(models, mode="json")).body
+            encoders["pydantic"] = lambda: adapter.dump_json(models)
+            for name, encode in encoders.items():
+                body, encode_ms = _timed(encode, args.repeat)
+                gzipped, gzip_ms = _timed(lambda: gzip.compress(body, compresslevel=args.gzip_level), args.repeat)
+                if BROTLI_AVAILABLE:
+                    brotlied, br_ms = _timed(lambda: brotli.compress(body, quality=args.brotli_quality), args.repeat)
+                    br_cols = f"{len(brotlied):>9} {br_ms:>7.2f}"
+                else:
+                    br_cols = f"{'-':>9} {'-':>7}"
+                print(f"{size:>6} {name:>9} {encode_ms:>10.2f} {len(body):>10} {len(gzipped):>9} {gzip_ms:>8.2f} {br_cols}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--gzip-level", type=int, default=settings.response_gzip_level)
+    parser.add_argument("--brotli-quality", type=int, default=settings.response_brotli_quality)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
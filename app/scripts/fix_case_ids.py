@@ -1,17 +1,80 @@
+"""Assign a case_id to every case that is missing one.
+
+Rows are fixed in id-ordered batches, one transaction per batch, so the
+backfill never holds more than one batch in memory or locks the table for
+long. It is safe to interrupt: rerunning picks up the rows still missing a
+case_id, and --start-after skips ids that are already known to be done.
+
+Usage:
+    python -m app.scripts.fix_case_ids --batch-size 1000
+"""
+import argparse
+import time
 import uuid
-from sqlalchemy.orm import sessionmaker
+from typing import Callable, Optional
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.engine import Engine
+
 from app.database import engine
 from app.models.case import Case
 
-Session = sessionmaker(bind=engine)
-session = Session()
+def _missing_case_id():
+    return or_(Case.case_id.is_(None), Case.case_id == "")
+
+def backfill_case_ids(
+    engine: Engine,
+    batch_size: int = 1000,
+    start_after: int = 0,
+    progress: Optional[Callable[[int, int, int], None]] = None
+) -> int:
+    """Backfill missing case_ids and return how many rows were updated.
+
+    `progress` is called after each committed batch with
+    (rows updated so far, rows that were missing at the start, last id).
+    """
+    table = Case.__table__
+    with engine.connect() as conn:
+        total = conn.execute(
+            select(func.count()).select_from(table).where(_missing_case_id(), table.c.id > start_after)
+        ).scalar_one()
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"), _missing_case_id())
+        .values(case_id=bindparam("new_case_id"))
+    )
+    done = 0
+    last_id = start_after
+    while True:
+        with engine.begin() as conn:
+            ids = conn.execute(
+                select(table.c.id)
+                .where(_missing_case_id(), table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            conn.execute(statement, [{"row_id": row_id, "new_case_id": str(uuid.uuid4())} for row_id in ids])
+        done += len(ids)
+        last_id = ids[-1]
+        if progress:
+            progress(done, total, last_id)
+    return done
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--start-after", type=int, default=0, help="Only consider cases with a larger id")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
 
-cases = session.query(Case).filter((Case.case_id == None) | (Case.case_id == '')).all()
+    def report(done, total, last_id):
+        print(f"backfilled {done}/{total} cases (last id {last_id}, {time.perf_counter() - start:.1f}s)", flush=True)
 
-for case in cases:
-    case.case_id = str(uuid.uuid4())
-    print(f"Updated case id {case.id} with new case_id {case.case_id}")
+    updated = backfill_case_ids(engine, args.batch_size, args.start_after, report)
+    print(f"done: {updated} cases given a case_id")
 
-session.commit()
-session.close()
-print("All cases with missing case_id have been updated.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(Exception):
+    """Raised when a job cannot be accepted because the queue is at capacity"""
+
+
+class JobBackend(ABC):
+    """Transport for queued case IDs.
+
+    The in-process backend below keeps jobs in memory; an out-of-process
+    backend (Redis, a broker, a DB table) only needs to implement these methods.
+    """
+
+    @abstractmethod
+    def put_nowait(self, job_id: str) -> None:
+        """Queue a job, raising JobQueueFullError when at capacity"""
+
+    @abstractmethod
+    async def put(self, job_id: str) -> None:
+        """Queue a job, waiting for capacity"""
+
+    @abstractmethod
+    async def get(self) -> str:
+        """Wait for and return the next job"""
+
+    @abstractmethod
+    def task_done(self) -> None:
+        """Mark the job last returned by get() as finished"""
+
+    @abstractmethod
+    def qsize(self) -> int:
+        """Number of jobs waiting"""
+
+
+class InProcessJobBackend(JobBackend):
+    """Bounded asyncio queue living in the API process"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so the queue binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    def put_nowait(self, job_id: str) -> None:
+        try:
+            self.queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(f"Job queue is full ({self.maxsize} jobs)")
+
+    async def put(self, job_id: str) -> None:
+        await self.queue.put(job_id)
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+    def task_done(self) -> None:
+        self.queue.task_done()
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+
+class CaseJobQueue:
+    """Fixed-size worker pool that processes queued cases in the background"""
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[None]],
+        backend: JobBackend,
+        workers: int
+    ):
+        self.handler = handler
+        self.backend = backend
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._active: set = set()
+        self.completed_total = 0
+        self.failed_total = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self, recovered_job_ids: Iterable[str] = ()) -> None:
+        """Start the workers and re-enqueue jobs left over from a previous run"""
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.ensure_future(self._worker(index)) for index in range(self.workers)
+        ]
+        recovered = list(recovered_job_ids)
+        if recovered:
+            logger.info(f"Re-enqueueing {len(recovered)} unfinished case jobs")
+            self._tasks.append(asyncio.ensure_future(self._enqueue_all(recovered)))
+
+    async def stop(self) -> None:
+        """Stop the workers; unfinished jobs stay 'processing' and are recovered on restart"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _enqueue_all(self, job_ids: List[str]) -> None:
+        for job_id in job_ids:
+            await self.backend.put(job_id)
+
+    def enqueue(self, job_id: str) -> None:
+        """Queue a job, raising JobQueueFullError when at capacity"""
+        self.backend.put_nowait(job_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self.backend.get()
+            self._active.add(job_id)
+            try:
+                await self.handler(job_id)
+                self.completed_total += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed_total += 1
+                logger.error(f"Case job {job_id} failed in worker {index}: {str(e)}", exc_info=True)
+            finally:
+                self._active.discard(job_id)
+                self.backend.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.backend.qsize(),
+            "active": len(self._active),
+            "completed_total": self.completed_total,
+            "failed_total": self.failed_total
+        }
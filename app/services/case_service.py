@@ -0,0 +1,133 @@
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import AsyncSessionLocal
+from app.models.case import Case
+
+logger = logging.getLogger(__name__)
+
+def apply_agent_response(case: Case, agent_response: Dict[str, Any]) -> None:
+    """Copy the legal agent output onto a case row"""
+    next_steps = agent_response.get("next_steps", [])
+    if not isinstance(next_steps, list):
+        next_steps = [str(next_steps)]
+
+    case.generated_draft = agent_response["draft"]
+    case.applicable_laws = list(agent_response["applicable_laws"])
+    case.suggested_ngos = list(agent_response["suggested_ngos"])
+    case.next_steps = next_steps
+
+async def _load_processing_case(db: AsyncSession, case_id: str) -> Optional[Case]:
+    case = (await db.execute(select(Case).where(Case.case_id == case_id))).scalars().first()
+    return case if case is not None and case.status == "processing" else None
+
+async def process_case_job(case_id: str, agent) -> None:
+    """Run the legal agent for a case queued with status 'processing' and store the results.
+
+    The agent call runs outside any transaction: the case is read in one
+    session and the results are written in another, so the write is stamped
+    with the time it actually happened.
+    """
+    async with AsyncSessionLocal() as db:
+        case = await _load_processing_case(db, case_id)
+        if case is None:
+            logger.warning(f"Skipping case job {case_id}: case missing or already processed")
+            return
+    try:
+        agent_response = await agent.process_case(
+            title=case.title,
+            description=case.description,
+            category=case.category,
+            location=case.location
+        )
+    except Exception as e:
+        logger.error(f"Error processing case job {case_id}: {str(e)}", exc_info=True)
+        agent_response = None
+    async with AsyncSessionLocal() as db:
+        case = await _load_processing_case(db, case_id)
+        if case is None:
+            logger.warning(f"Dropping case job {case_id} result: case deleted or updated meanwhile")
+            return
+        if agent_response is None:
+            case.status = "failed"
+        else:
+            apply_agent_response(case, agent_response)
+            case.status = "pending"
+        await db.commit()
+
+async def get_processing_case_ids() -> List[str]:
+    """Case IDs left in 'processing', e.g. by a restart, that need to be re-enqueued"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Case.case_id).where(Case.status == "processing"))
+        return list(result.scalars().all())
+
+async def process_case_batch(
+    items: List[Any],
+    user,
+    agent,
+    db: AsyncSession,
+    concurrency: int,
+    chunk_size: int
+) -> List[Dict[str, Any]]:
+    """Run the legal agent over many cases with bounded parallelism.
+    
+    All items are processed concurrently up to `concurrency`; results are written
+    with one bulk insert per chunk of `chunk_size` items as each chunk completes.
+    Returns one result dict per item, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item) -> Dict[str, Any]:
+        async with semaphore:
+            return await agent.process_case(
+                title=item.title,
+                description=item.description,
+                category=item.category,
+                location=user.location
+            )
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    try:
+        for start in range(0, len(items), chunk_size):
+            indexes = range(start, min(start + chunk_size, len(items)))
+            outcomes = await asyncio.gather(*(tasks[i] for i in indexes), return_exceptions=True)
+            rows = []
+            for index, outcome in zip(indexes, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Batch item {index} failed: {str(outcome)}")
+                    results[index] = {"index": index, "status": "error", "error": str(outcome)}
+                    continue
+                item = items[index]
+                db_case = Case(
+                    case_id=str(uuid.uuid4()),
+                    title=item.title,
+                    description=item.description,
+                    category=item.category,
+                    location=user.location,
+                    status="pending",
+                    user_id=user.id
+                )
+                apply_agent_response(db_case, outcome)
+                rows.append((index, db_case))
+            if not rows:
+                continue
+            try:
+                db.add_all([db_case for _, db_case in rows])
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Bulk insert for batch chunk at {start} failed: {str(e)}", exc_info=True)
+                for index, _ in rows:
+                    results[index] = {"index": index, "status": "error", "error": "Database error occurred"}
+                continue
+            for index, db_case in rows:
+                results[index] = {"index": index, "status": "created", "case_id": db_case.case_id}
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results
@@ -1,112 +1,327 @@
+import asyncio
+import logging
+import time
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 import json
 from ..config import settings
+from ..logging_config import sample_payload
+from .llm_providers import LLMProvider
+from .resilience import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    RETRYABLE_STATUS_CODES,
+    UpstreamUnavailableError,
+    backoff_delay
+)
 
-class GeminiService:
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+class GeminiService(LLMProvider):
+    name = "gemini"
+    
     def __init__(self):
         self.api_key = settings.gemini_api_key
         self.api_url = settings.gemini_api_url
+        self.stream_url = self.api_url.replace(":generateContent", ":streamGenerateContent")
+        super().__init__(self.api_url.rsplit("/models/", 1)[-1].split(":", 1)[0])
         self.headers = {
             "Content-Type": "application/json"
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests_total = 0
+        self._requests_in_flight = 0
+        self.limiter = AdaptiveLimiter(
+            initial_limit=settings.gemini_concurrency_initial,
+            min_limit=settings.gemini_concurrency_min,
+            max_limit=settings.gemini_concurrency_max,
+            latency_target=settings.gemini_latency_target
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.gemini_breaker_failure_threshold,
+            recovery_timeout=settings.gemini_breaker_recovery_timeout
+        )
+        self._retries_total = 0
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client shared by all Gemini calls"""
+        limits = httpx.Limits(
+            max_connections=settings.gemini_max_connections,
+            max_keepalive_connections=settings.gemini_max_keepalive_connections,
+            keepalive_expiry=settings.gemini_keepalive_expiry
+        )
+        timeout = httpx.Timeout(
+            connect=settings.gemini_connect_timeout,
+            read=settings.gemini_read_timeout,
+            write=settings.gemini_write_timeout,
+            pool=settings.gemini_pool_timeout
+        )
+        return httpx.AsyncClient(
+            http2=settings.gemini_http2 and HTTP2_AVAILABLE,
+            limits=limits,
+            timeout=timeout,
+            headers=self.headers
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the pooled client, creating it lazily outside the app lifecycle"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+    
+    async def startup(self):
+        """Open the connection pool (called on application startup)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
     
-    async def generate_content(self, prompt: str) -> Optional[str]:
-        """Generate content using Gemini API (flash model, cURL style)"""
+    async def shutdown(self):
+        """Close the connection pool (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics for monitoring"""
+        stats = {
+            "http2": settings.gemini_http2 and HTTP2_AVAILABLE,
+            "max_connections": settings.gemini_max_connections,
+            "max_keepalive_connections": settings.gemini_max_keepalive_connections,
+            "keepalive_expiry": settings.gemini_keepalive_expiry,
+            "requests_total": self._requests_total,
+            "requests_in_flight": self._requests_in_flight,
+            "coalesced_total": self._coalesced_total,
+            "connections": 0,
+            "idle_connections": 0,
+            "active_connections": 0
+        }
+        if self._client is None or self._client.is_closed:
+            return stats
+        pool = getattr(self._client._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for conn in connections if conn.is_idle())
+        stats.update({
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle
+        })
+        return stats
+    
+    def _build_payload(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        payload = {
+            "contents": [
+                {
+                    "parts": [
+                        {
+                            "text": prompt
+                        }
+                    ]
+                }
+            ]
+        }
+        if response_schema is not None:
+            payload["generationConfig"] = {
+                "responseMimeType": "application/json",
+                "responseSchema": response_schema
+            }
+        return payload
+    
+    @staticmethod
+    def _extract_text(result: Dict[str, Any]) -> Optional[str]:
+        """Extract the generated text from a Gemini response body"""
+        if "candidates" in result and len(result["candidates"]) > 0:
+            candidate = result["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                parts = candidate["content"]["parts"]
+                if len(parts) > 0 and "text" in parts[0]:
+                    return parts[0]["text"]
+        return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update({
+            "pool": self.get_pool_stats(),
+            "admission": self.get_admission_stats()
+        })
+        return stats
+    
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """Limiter, retry and circuit breaker statistics for monitoring"""
+        return {
+            "limiter": self.limiter.get_stats(),
+            "circuit_breaker": self.circuit_breaker.get_stats(),
+            "retries_total": self._retries_total
+        }
+    
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
         try:
-            payload = {
-                "contents": [
-                    {
-                        "parts": [
-                            {
-                                "text": prompt
-                            }
-                        ]
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+    
+    async def _post(self, payload: Dict[str, Any]) -> httpx.Response:
+        """Send one request through the adaptive concurrency limiter"""
+        await self.limiter.acquire()
+        self._requests_total += 1
+        self._requests_in_flight += 1
+        start = time.perf_counter()
+        overloaded = True
+        try:
+            response = await self.client.post(
+                f"{self.api_url}?key={self.api_key}",
+                json=payload
+            )
+            overloaded = response.status_code == 429
+            return response
+        finally:
+            self._requests_in_flight -= 1
+            await self.limiter.release(time.perf_counter() - start, overloaded=overloaded)
+    
+    async def _generate_content(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Generate content using Gemini API (flash model, cURL style).
+        
+        Retryable failures are retried with jittered exponential backoff. Raises
+        CircuitOpenError instead of calling upstream while the circuit is open,
+        and UpstreamUnavailableError once the retries are used up.
+        """
+        payload = self._build_payload(prompt, response_schema)
+        
+        logger.debug(
+            "Gemini request",
+            extra={"url": self.api_url, "prompt_chars": len(prompt), "payload": sample_payload(payload)}
+        )
+        
+        max_retries = settings.gemini_max_retries
+        for attempt in range(max_retries + 1):
+            probe = self.circuit_breaker.check()
+            retry_after = None
+            try:
+                response = await self._post(payload)
+            except httpx.TimeoutException as e:
+                logger.warning(f"Gemini request timed out: {type(e).__name__}", extra={"attempt": attempt})
+                self.circuit_breaker.record_failure()
+            except httpx.HTTPError as e:
+                logger.warning(f"Gemini HTTP error: {str(e)}", extra={"attempt": attempt})
+                self.circuit_breaker.record_failure()
+            except Exception as e:
+                logger.error(f"Unexpected Gemini error: {str(e)}", exc_info=True)
+                self.circuit_breaker.record_failure()
+                raise UpstreamUnavailableError(f"Unexpected Gemini error: {str(e)}") from e
+            else:
+                logger.debug(
+                    "Gemini response",
+                    extra={
+                        "status_code": response.status_code,
+                        "response_bytes": len(response.content),
+                        "body": sample_payload(response.text)
                     }
-                ]
-            }
-            
-            print(f"\nMaking API request to: {self.api_url}")
-            print(f"Payload: {json.dumps(payload, indent=2)}")
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_url}?key={self.api_key}",
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0  # Add timeout
                 )
                 
-                print(f"Response status: {response.status_code}")
-                print(f"Response body: {response.text[:500]}...")  # Print first 500 chars
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    # Extract the generated text from the response
-                    if "candidates" in result and len(result["candidates"]) > 0:
-                        candidate = result["candidates"][0]
-                        if "content" in candidate and "parts" in candidate["content"]:
-                            parts = candidate["content"]["parts"]
-                            if len(parts) > 0 and "text" in parts[0]:
-                                return parts[0]["text"]
-                    # If there's an error field in a 200 response
-                    if "error" in result:
-                        print(f"Gemini API error: {result['error']}")
-                else:
-                    # Print error details for non-200 responses
-                    try:
-                        error_json = response.json()
-                        print(f"Gemini API error (non-200): {error_json}")
-                    except Exception:
-                        print("Non-JSON error response:", response.text)
-                return None
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.circuit_breaker.record_success()
+                    return self._parse_response(response)
                 
-        except httpx.TimeoutException:
-            print("Request timed out after 30 seconds")
-            return None
-        except httpx.HTTPError as e:
-            print(f"HTTP Error: {str(e)}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response text: {e.response.text}")
-            return None
-        except Exception as e:
-            print(f"Unexpected error: {str(e)}")
-            return None
+                self.circuit_breaker.record_failure()
+                retry_after = self._retry_after(response)
+                logger.warning(
+                    f"Gemini API retryable error: {response.status_code}",
+                    extra={"attempt": attempt, "retry_after": retry_after}
+                )
+            finally:
+                # A cancelled probe recorded no outcome; let the next call probe instead
+                if probe:
+                    self.circuit_breaker.release_probe()
+            
+            if attempt < max_retries:
+                self._retries_total += 1
+                await asyncio.sleep(backoff_delay(
+                    attempt,
+                    settings.gemini_retry_base_delay,
+                    settings.gemini_retry_max_delay,
+                    retry_after
+                ))
+        raise UpstreamUnavailableError(
+            f"Gemini request failed after {max_retries + 1} attempts",
+            retry_after or 0.0
+        )
     
-    async def generate_legal_analysis(
-        self,
-        title: str,
-        description: str,
-        category: str,
-        location: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Generate legal analysis using Gemini"""
-        prompt = f"""Legal Case Analysis:
-Title: {title}
-Description: {description}
-Category: {category}
-Location: {location if location else 'Not specified'}
-
-Provide a concise analysis covering:
-1. Applicable laws and sections
-2. Legal grounds
-3. Next steps
-4. Timeline
-5. Potential challenges
-
-Keep the response clear and structured with bullet points."""
-        
-        print(f"\nGenerating legal analysis for case: {title}")
-        response = await self.generate_content(prompt)
-        if response:
-            return {
-                "analysis": response,
-                "source": "gemini"
-            }
-        return {
-            "analysis": "Unable to generate analysis at this time.",
-            "source": "error"
-        }
+    def _parse_response(self, response: httpx.Response) -> Optional[str]:
+        """Extract generated text from a non-retryable response, logging API errors"""
+        if response.status_code == 200:
+            result = response.json()
+            # Extract the generated text from the response
+            text = self._extract_text(result)
+            if text is not None:
+                return text
+            # If there's an error field in a 200 response
+            if "error" in result:
+                logger.error(f"Gemini API error: {result['error']}")
+        else:
+            # Log error details for non-200 responses
+            try:
+                error_json = response.json()
+                logger.error(f"Gemini API error ({response.status_code}): {error_json}")
+            except Exception:
+                logger.error(f"Gemini API non-JSON error response ({response.status_code}): {response.text[:500]}")
+        return None
+    
+    async def _stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """Stream generated text chunks from the Gemini streamGenerateContent endpoint"""
+        probe = self.circuit_breaker.check()
+        try:
+            await self.limiter.acquire()
+            self._requests_total += 1
+            self._requests_in_flight += 1
+            start = time.perf_counter()
+            time_to_headers = None
+            overloaded = True
+            try:
+                async with self.client.stream(
+                    "POST",
+                    f"{self.stream_url}?alt=sse&key={self.api_key}",
+                    json=self._build_payload(prompt)
+                ) as response:
+                    time_to_headers = time.perf_counter() - start
+                    overloaded = response.status_code == 429
+                    if response.status_code != 200:
+                        if response.status_code in RETRYABLE_STATUS_CODES:
+                            self.circuit_breaker.record_failure()
+                        else:
+                            self.circuit_breaker.record_success()
+                        body = await response.aread()
+                        logger.error(f"Gemini API stream error ({response.status_code}): {body[:500]!r}")
+                        return
+                    self.circuit_breaker.record_success()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        try:
+                            event = json.loads(line[len("data:"):].strip())
+                        except json.JSONDecodeError:
+                            continue
+                        text = self._extract_text(event)
+                        if text:
+                            yield text
+            except httpx.HTTPError as e:
+                logger.warning(f"Gemini HTTP error while streaming: {str(e)}")
+                self.circuit_breaker.record_failure()
+                return
+            finally:
+                self._requests_in_flight -= 1
+                # Adapt on time to response headers; stream duration depends on output length
+                latency = time_to_headers if time_to_headers is not None else time.perf_counter() - start
+                await self.limiter.release(latency, overloaded=overloaded)
+        finally:
+            # Covers a client disconnect or cancellation before any response arrived
+            if probe:
+                self.circuit_breaker.release_probe()
 
 # Create a singleton instance
 gemini_service = GeminiService() 
\ No newline at end of file
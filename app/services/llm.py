@@ -0,0 +1,42 @@
+from typing import Optional
+from ..config import settings
+from .llm_providers import LLMProvider, OpenAIService, FakeLLMService, HedgedLLMService
+from .gemini_service import gemini_service
+
+_provider: Optional[LLMProvider] = None
+
+def create_llm_provider(name: str) -> LLMProvider:
+    """Create the provider selected by name ("gemini", "openai" or "fake")"""
+    if name == "gemini":
+        return gemini_service
+    if name == "openai":
+        return OpenAIService()
+    if name == "fake":
+        return FakeLLMService()
+    raise ValueError(f"Unknown LLM provider '{name}'")
+
+def create_configured_provider() -> LLMProvider:
+    """Create settings.llm_provider, hedged with settings.llm_hedge_provider when enabled"""
+    provider = create_llm_provider(settings.llm_provider)
+    if settings.llm_hedge_enabled and settings.llm_hedge_provider != settings.llm_provider:
+        provider = HedgedLLMService(
+            primary=provider,
+            secondary=create_llm_provider(settings.llm_hedge_provider),
+            percentile=settings.llm_hedge_percentile,
+            min_samples=settings.llm_hedge_min_samples,
+            initial_delay=settings.llm_hedge_initial_delay,
+            max_hedge_rate=settings.llm_hedge_max_rate
+        )
+    return provider
+
+def get_llm_provider() -> LLMProvider:
+    """Return the active provider, creating it from settings on first use"""
+    global _provider
+    if _provider is None:
+        _provider = create_configured_provider()
+    return _provider
+
+def set_llm_provider(provider: LLMProvider) -> None:
+    """Swap the active provider, e.g. for tests and offline benchmarks"""
+    global _provider
+    _provider = provider
@@ -0,0 +1,476 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Any, Optional, AsyncIterator
+from ..config import settings
+from .llm_cache import llm_cache
+from .resilience import UpstreamUnavailableError
+from ..agent.prompt_builder import build_legal_analysis_prompt
+from ..agent.structured_output import LEGAL_ANALYSIS_SCHEMA, parse_legal_analysis, render_legal_analysis
+
+logger = logging.getLogger(__name__)
+
+class ProviderText(str):
+    """Generated text tagged with the name of the provider that produced it"""
+
+    def __new__(cls, text: str, source: str):
+        value = super().__new__(cls, text)
+        value.source = source
+        return value
+
+
+class LLMProvider(ABC):
+    """Base class for text generation backends.
+
+    Subclasses implement `_generate_content` (and optionally `_stream_content`);
+    response caching, coalescing of identical in-flight prompts and the legal
+    analysis helpers are shared here. Passing `response_schema` asks the
+    provider for JSON output matching that schema.
+    """
+
+    name = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+        self.generation_config: Dict[str, Any] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._coalesced_total = 0
+
+    async def startup(self):
+        """Acquire provider resources (called on application startup)"""
+
+    async def shutdown(self):
+        """Release provider resources (called on application shutdown)"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.name,
+            "model": self.model,
+            "coalesced_total": self._coalesced_total
+        }
+
+    @abstractmethod
+    async def _generate_content(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Call the backend once, bypassing the cache and coalescing"""
+
+    def _cache_params(self, response_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if response_schema is None:
+            return self.generation_config
+        return {**self.generation_config, "response_schema": response_schema}
+
+    async def _stream_content(self, prompt: str) -> AsyncIterator[str]:
+        # Providers without native streaming return the whole completion as one chunk
+        text = await self._generate_content(prompt)
+        if text:
+            yield text
+
+    async def generate_content(
+        self,
+        prompt: str,
+        use_cache: bool = True,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Generate content, serving repeats from the response cache and coalescing identical concurrent prompts"""
+        cache_key = llm_cache.make_key(self.model, prompt, self._cache_params(response_schema))
+        if use_cache:
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        pending = self._pending.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._generate_and_cache(prompt, cache_key, response_schema))
+            self._pending[cache_key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(cache_key, None))
+        else:
+            self._coalesced_total += 1
+        # Shield the shared call so one cancelled waiter does not cancel the others
+        return await asyncio.shield(pending)
+
+    async def _generate_and_cache(
+        self,
+        prompt: str,
+        cache_key: str,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        result = await self._generate_content(prompt, response_schema)
+        if result is not None:
+            await llm_cache.set(cache_key, result)
+        return result
+
+    async def stream_content(self, prompt: str, use_cache: bool = True) -> AsyncIterator[str]:
+        """Stream generated text chunks, serving a cached completion as a single chunk"""
+        cache_key = llm_cache.make_key(self.model, prompt, self.generation_config)
+        if use_cache:
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        async for chunk in self._stream_content(prompt):
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            await llm_cache.set(cache_key, "".join(chunks))
+
+    def build_legal_analysis_prompt(
+        self,
+        title: str,
+        description: str,
+        category: str,
+        location: Optional[str] = None
+    ) -> str:
+        """Build the prompt used for case analysis"""
+        return build_legal_analysis_prompt(title, description, category, location)
+
+    def format_legal_analysis(self, response: Optional[str]) -> Dict[str, Any]:
+        """Wrap generated analysis in the response shape used by the agent.
+        
+        JSON responses matching LEGAL_ANALYSIS_SCHEMA are validated here and kept
+        under "structured"; "analysis" always holds readable text.
+        """
+        source = getattr(response, "source", self.name)
+        structured = parse_legal_analysis(response) if response and response.lstrip().startswith("{") else None
+        if structured is not None:
+            return {
+                "analysis": render_legal_analysis(structured),
+                "structured": structured.model_dump(),
+                "source": source
+            }
+        if response:
+            return {
+                "analysis": str(response),
+                "source": source
+            }
+        return {
+            "analysis": "Unable to generate analysis at this time.",
+            "source": "error"
+        }
+
+    async def generate_legal_analysis(
+        self,
+        title: str,
+        description: str,
+        category: str,
+        location: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate legal analysis for a case"""
+        prompt = self.build_legal_analysis_prompt(title, description, category, location)
+        logger.info(f"Generating legal analysis for case: {title}")
+        response = await self.generate_content(prompt, response_schema=LEGAL_ANALYSIS_SCHEMA)
+        return self.format_legal_analysis(response)
+
+
+class OpenAIService(LLMProvider):
+    """OpenAI chat completions backend, used as the fallback provider"""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+        super().__init__(model or settings.openai_model)
+        self.api_key = api_key or settings.openai_api_key
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                timeout=settings.openai_timeout,
+                max_retries=settings.openai_max_retries
+            )
+        return self._client
+
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _generate_content(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        options = dict(self.generation_config)
+        if response_schema is not None:
+            # JSON mode takes no schema, so describe it in the prompt instead
+            prompt = f"{prompt}\n\nRespond only with a JSON object matching this schema:\n{json.dumps(response_schema)}"
+            options["response_format"] = {"type": "json_object"}
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                **options
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            logger.error(f"OpenAI request failed: {str(e)}")
+            return None
+
+    async def _stream_content(self, prompt: str) -> AsyncIterator[str]:
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True,
+                **self.generation_config
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"OpenAI stream failed: {str(e)}")
+
+
+class FakeLLMService(LLMProvider):
+    """Deterministic offline provider for tests, load tests and benchmarks.
+
+    Latency, failures and response text are derived from a hash of the seed and
+    prompt, so a given prompt always behaves the same way regardless of call order.
+    """
+
+    name = "fake"
+
+    LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+    WORDS = (
+        "the", "complainant", "may", "approach", "district", "commission", "under",
+        "section", "act", "within", "days", "notice", "relief", "evidence", "court",
+        "legal", "aid", "authority", "police", "complaint", "file", "rights"
+    )
+
+    def __init__(
+        self,
+        latency_distribution: Optional[str] = None,
+        latency_mean: Optional[float] = None,
+        latency_stddev: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        response_words: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        super().__init__("fake-model")
+        self.latency_distribution = latency_distribution or settings.fake_llm_latency_distribution
+        if self.latency_distribution not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{self.latency_distribution}'")
+        self.latency_mean = settings.fake_llm_latency_mean if latency_mean is None else latency_mean
+        self.latency_stddev = settings.fake_llm_latency_stddev if latency_stddev is None else latency_stddev
+        self.error_rate = settings.fake_llm_error_rate if error_rate is None else error_rate
+        self.response_words = settings.fake_llm_response_words if response_words is None else response_words
+        self.seed = settings.fake_llm_seed if seed is None else seed
+        self.calls = 0
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).hexdigest()
+        return random.Random(int(digest[:16], 16))
+
+    def _latency(self, rng: random.Random) -> float:
+        if self.latency_distribution == "fixed" or self.latency_mean <= 0:
+            return max(0.0, self.latency_mean)
+        if self.latency_distribution == "uniform":
+            spread = self.latency_stddev * math.sqrt(3)
+            return max(0.0, rng.uniform(self.latency_mean - spread, self.latency_mean + spread))
+        # Lognormal parameterised by the desired mean and standard deviation
+        variance = math.log(1 + (self.latency_stddev / self.latency_mean) ** 2)
+        mu = math.log(self.latency_mean) - variance / 2
+        return rng.lognormvariate(mu, math.sqrt(variance))
+
+    def _words(self, rng: random.Random, count: int) -> str:
+        return " ".join(rng.choice(self.WORDS) for _ in range(count))
+
+    def _fake_value(self, schema: Dict[str, Any], rng: random.Random) -> Any:
+        """Build a value matching a (Gemini-style) response schema"""
+        kind = schema.get("type", "STRING").upper()
+        if kind == "OBJECT":
+            return {key: self._fake_value(value, rng) for key, value in schema.get("properties", {}).items()}
+        if kind == "ARRAY":
+            return [self._fake_value(schema.get("items", {}), rng) for _ in range(rng.randint(1, 3))]
+        if kind in ("INTEGER", "NUMBER"):
+            return rng.randint(1, 30)
+        if kind == "BOOLEAN":
+            return rng.random() < 0.5
+        return self._words(rng, max(1, self.response_words // 20))
+
+    async def _generate_content(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        self.calls += 1
+        rng = self._rng(prompt)
+        await asyncio.sleep(self._latency(rng))
+        if rng.random() < self.error_rate:
+            # Fail the way real providers do once their retries are exhausted
+            raise UpstreamUnavailableError("Injected fake LLM error")
+        if response_schema is not None:
+            return json.dumps(self._fake_value(response_schema, rng))
+        return self._words(rng, self.response_words)
+
+    async def _stream_content(self, prompt: str) -> AsyncIterator[str]:
+        text = await self._generate_content(prompt)
+        if not text:
+            return
+        words = text.split(" ")
+        for start in range(0, len(words), 20):
+            chunk = " ".join(words[start:start + 20])
+            yield chunk if start == 0 else " " + chunk
+            await asyncio.sleep(0)
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies with percentile lookup"""
+
+    def __init__(self, window: int):
+        self._samples = deque(maxlen=window)
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)
+        return ordered[max(0, index)]
+
+
+class HedgedLLMService(LLMProvider):
+    """Send a backup request to a secondary provider when the primary is slow.
+
+    The hedge fires once the primary call has been running longer than its
+    tracked latency percentile (or fails outright). The first good response wins
+    and the other call is cancelled. Hedging is skipped while the observed hedge
+    rate is above `max_hedge_rate`, which keeps the extra cost bounded.
+    Responses are ProviderText, so the analysis source names the provider that
+    won. Streaming is served by the primary provider only.
+    """
+
+    name = "hedged"
+
+    def __init__(
+        self,
+        primary: LLMProvider,
+        secondary: LLMProvider,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        initial_delay: float = 10.0,
+        max_hedge_rate: float = 0.1,
+        window: int = 200
+    ):
+        super().__init__(primary.model)
+        self.primary = primary
+        self.secondary = secondary
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.max_hedge_rate = max_hedge_rate
+        self.latencies = LatencyTracker(window)
+        self.requests_total = 0
+        self.hedged_total = 0
+        self.secondary_wins = 0
+
+    async def startup(self):
+        await self.primary.startup()
+        await self.secondary.startup()
+
+    async def shutdown(self):
+        await self.primary.shutdown()
+        await self.secondary.shutdown()
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the primary before hedging"""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_delay
+        return self.latencies.percentile(self.percentile)
+
+    def _may_hedge(self) -> bool:
+        if not self.requests_total:
+            return True
+        return self.hedged_total / self.requests_total < self.max_hedge_rate
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update({
+            "primary": self.primary.get_stats(),
+            "secondary": self.secondary.get_stats(),
+            "requests_total": self.requests_total,
+            "hedged_total": self.hedged_total,
+            "secondary_wins": self.secondary_wins,
+            "hedge_rate": round(self.hedged_total / self.requests_total, 4) if self.requests_total else 0.0,
+            "win_rate": round(self.secondary_wins / self.hedged_total, 4) if self.hedged_total else 0.0,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 2)
+        })
+        return stats
+
+    def _track_latency(self, primary: asyncio.Future) -> None:
+        """Record the primary's latency however its call ends.
+
+        A call cancelled because the secondary won records its elapsed time as
+        a lower bound; counting only the calls the primary won would bias the
+        percentile low and let the hedge rate creep up. Calls that raised are
+        skipped, since a fail-fast rejection says nothing about response time.
+        """
+        start = time.perf_counter()
+
+        def record(task: asyncio.Future) -> None:
+            if task.cancelled() or task.exception() is None:
+                self.latencies.record(time.perf_counter() - start)
+
+        primary.add_done_callback(record)
+
+    @staticmethod
+    def _tagged(result: Optional[str], provider: LLMProvider) -> Optional[str]:
+        return None if result is None else ProviderText(result, provider.name)
+
+    async def _generate_content(self, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        self.requests_total += 1
+        primary = asyncio.ensure_future(self.primary._generate_content(prompt, response_schema))
+        self._track_latency(primary)
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay())
+        if done:
+            primary_result = self._result(primary)
+            if primary_result is not None:
+                return self._tagged(primary_result, self.primary)
+            if not self._may_hedge():
+                return self._tagged(self._result(primary, raise_error=True), self.primary)
+
+        if not done and not self._may_hedge():
+            return self._tagged(await primary, self.primary)
+
+        self.hedged_total += 1
+        secondary = asyncio.ensure_future(self.secondary._generate_content(prompt, response_schema))
+        pending = {secondary} if done else {primary, secondary}
+        try:
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    result = self._result(task)
+                    if result is None:
+                        continue
+                    if task is secondary:
+                        self.secondary_wins += 1
+                        return self._tagged(result, self.secondary)
+                    return self._tagged(result, self.primary)
+        finally:
+            for task in (primary, secondary):
+                task.cancel()
+        # Neither provider produced a response; surface the primary's error if it raised
+        return self._result(primary, raise_error=True)
+
+    @staticmethod
+    def _result(task: asyncio.Future, raise_error: bool = False) -> Optional[str]:
+        if task.cancelled():
+            return None
+        error = task.exception()
+        if error is not None:
+            if raise_error:
+                raise error
+            logger.warning(f"LLM call failed during hedged request: {str(error)}")
+            return None
+        return task.result()
+
+    async def _stream_content(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self.primary._stream_content(prompt):
+            yield chunk
@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, String, and_, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque token pointing just past (created_at, id)"""
+    payload = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+def _timestamp_forms(value: datetime, dialect_name: str) -> List[Any]:
+    """Every stored form of `value`, lowest first"""
+    if dialect_name != "sqlite":
+        return [value]
+    # SQLite keeps timestamps as naive UTC text: CURRENT_TIMESTAMP writes no
+    # fractional seconds while datetimes bound from Python always carry six
+    # digits, so a whole second can be stored either way
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if value.microsecond:
+        return [literal(value.strftime("%Y-%m-%d %H:%M:%S.%f"), String)]
+    return [literal(value.strftime(fmt), String) for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f")]
+
+def timestamp_param(value: datetime, dialect_name: str) -> Any:
+    """Operand for >= / < comparisons of a timestamp column on the given dialect"""
+    return _timestamp_forms(value, dialect_name)[0]
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    created_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page ordered by (created_at, id), newest first unless descending=False.
+
+    Returns the rows and the cursor for the next page (None on the last page).
+    Each page is a single index range scan, so its cost does not grow with
+    the number of earlier pages.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        forms = _timestamp_forms(created_at, db.bind.dialect.name)
+        same_time = created_column.in_(forms) if len(forms) > 1 else created_column == forms[0]
+        if descending:
+            query = query.where(or_(
+                created_column < forms[0],
+                and_(same_time, id_column < row_id)
+            ))
+        else:
+            query = query.where(or_(
+                created_column > forms[-1],
+                and_(same_time, id_column > row_id)
+            ))
+    order = (created_column.desc(), id_column.desc()) if descending else (created_column.asc(), id_column.asc())
+    result = await db.execute(query.order_by(*order).limit(limit + 1))
+    rows = result.scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
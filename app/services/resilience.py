@@ -0,0 +1,174 @@
+import asyncio
+import random
+import time
+from typing import Dict, Any, Optional
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class UpstreamUnavailableError(Exception):
+    """Raised when the upstream service could not produce a response, even after retries"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised when the upstream circuit is open and calls are failing fast"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Upstream service unavailable, retry after {retry_after:.0f}s", retry_after)
+
+
+class AdaptiveLimiter:
+    """Bound in-flight upstream calls, adapting the limit to latency and throttling (AIMD).
+
+    The limit grows by one after each fast, successful call and is halved when a
+    call is throttled, times out or exceeds the latency target. Calls already in
+    flight when the limit was last halved saw the old limit, so their slow
+    outcomes do not halve it again: a burst of slow responses backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._waiting = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._last_decrease = float("-inf")
+        self.acquired_total = 0
+        self.throttled_total = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> None:
+        """Wait for an in-flight slot"""
+        condition = self._get_condition()
+        start = time.perf_counter()
+        async with condition:
+            self._waiting += 1
+            try:
+                await condition.wait_for(lambda: self._in_flight < self.limit)
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+        waited = time.perf_counter() - start
+        self.acquired_total += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+
+    async def release(self, latency: float, overloaded: bool = False) -> None:
+        """Free a slot and adjust the limit from the observed outcome"""
+        if overloaded or latency > self.latency_target:
+            if overloaded:
+                self.throttled_total += 1
+            now = time.perf_counter()
+            if now - latency >= self._last_decrease:
+                self._limit = max(float(self.min_limit), self._limit / 2)
+                self._last_decrease = now
+        else:
+            self._limit = min(float(self.max_limit), self._limit + 1)
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and wait time metrics for sizing workers"""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "acquired_total": self.acquired_total,
+            "throttled_total": self.throttled_total,
+            "wait_time_avg_ms": round(self.wait_time_total / self.acquired_total * 1000, 2) if self.acquired_total else 0.0,
+            "wait_time_max_ms": round(self.wait_time_max * 1000, 2)
+        }
+
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures, probing again after a cool-down"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected_total = 0
+        self._probe_in_flight = False
+
+    def check(self) -> bool:
+        """Raise CircuitOpenError unless a call is currently allowed.
+
+        Returns True when the admitted call is the half-open probe. The caller
+        must then end it with record_success, record_failure or release_probe.
+        """
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                self.rejected_total += 1
+                raise CircuitOpenError(remaining)
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected_total += 1
+                raise CircuitOpenError(self.recovery_timeout)
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Free the probe slot of a call that ended without an outcome, e.g. cancelled"""
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected_total": self.rejected_total
+        }
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter, honouring a server Retry-After hint"""
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, max_delay))
+    return delay
@@ -0,0 +1,98 @@
+import html
+import re
+from typing import Any, List, NamedTuple, Tuple
+
+from sqlalchemy import Select, column, func, literal, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.case import Case
+from app.models.case_search import SEARCH_CONFIG, SQLITE_FTS_TABLE, search_document
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The engines mark matches with private-use characters that case text will not
+# contain; the text is HTML-escaped before they become <mark> tags
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_WORDS = 16
+MAX_TERMS = 10
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+class SearchHit(NamedTuple):
+    case: Case
+    score: float
+    title_highlight: str
+    snippet: str
+
+def search_terms(q: str) -> List[str]:
+    """Split free text into plain word terms, so no query syntax reaches the engine"""
+    return _TERM_RE.findall(q.lower())[:MAX_TERMS]
+
+def _render_highlight(text: str) -> str:
+    """HTML-escape highlighted text, keeping only the engine's match markers as <mark> tags"""
+    return html.escape(text).replace(_MARK_START, HIGHLIGHT_START).replace(_MARK_END, HIGHLIGHT_END)
+
+def _sqlite_search(user_id: int, terms: List[str]) -> Select:
+    # Every term must match; the last one also matches as a prefix (search-as-you-type)
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+    fts = literal_column(SQLITE_FTS_TABLE)
+    fts_table = table(SQLITE_FTS_TABLE, column("rowid"))
+    # bm25 is lower-is-better; weights favour title over description over draft
+    rank = func.bm25(fts, 10.0, 5.0, 1.0)
+    return (
+        select(
+            Case,
+            (-rank).label("score"),
+            func.highlight(fts, 0, _MARK_START, _MARK_END).label("title_highlight"),
+            func.snippet(fts, -1, _MARK_START, _MARK_END, SNIPPET_ELLIPSIS, SNIPPET_WORDS).label("snippet")
+        )
+        .join(fts_table, fts_table.c.rowid == Case.id)
+        .where(fts.op("MATCH")(match), Case.user_id == user_id)
+        .order_by(rank, Case.id.desc())
+    )
+
+def _postgres_search(user_id: int, terms: List[str]) -> Select:
+    config = literal(SEARCH_CONFIG, literal_execute=True)
+    query = func.to_tsquery(config, " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+    rank = func.ts_rank_cd(search_document, query)
+    options = f'StartSel="{_MARK_START}", StopSel="{_MARK_END}"'
+    body = func.coalesce(Case.description, "").op("||")(" ").op("||")(func.coalesce(Case.generated_draft, ""))
+    return (
+        select(
+            Case,
+            rank.label("score"),
+            func.ts_headline(config, func.coalesce(Case.title, ""), query, f"{options}, HighlightAll=true").label("title_highlight"),
+            func.ts_headline(
+                config, body, query,
+                f"{options}, MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, FragmentDelimiter={SNIPPET_ELLIPSIS}"
+            ).label("snippet")
+        )
+        .where(search_document.op("@@")(query), Case.user_id == user_id)
+        .order_by(rank.desc(), Case.id.desc())
+    )
+
+async def search_cases(
+    db: AsyncSession,
+    user_id: int,
+    q: str,
+    limit: int,
+    offset: int = 0,
+    *options: Any
+) -> Tuple[List[SearchHit], bool]:
+    """Rank the user's cases against `q` and return one page of hits.
+
+    Returns the hits and whether more follow. Matching runs against the
+    full-text index (FTS5 on SQLite, a GIN tsvector index on Postgres).
+    """
+    terms = search_terms(q)
+    if not terms:
+        return [], False
+    build = _postgres_search if db.bind.dialect.name == "postgresql" else _sqlite_search
+    result = await db.execute(build(user_id, terms).options(*options).limit(limit + 1).offset(offset))
+    hits = [
+        SearchHit(row[0], row.score, _render_highlight(row.title_highlight or ""), _render_highlight(row.snippet or ""))
+        for row in result.all()
+    ]
+    return hits[:limit], len(hits) > limit
@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.case import Case
+from app.models.case_tombstone import CaseTombstone
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor, keyset_page
+
+class ChangeSet(NamedTuple):
+    changed: List[Case]
+    deleted: List[str]
+    next_token: str
+    has_more: bool
+
+def encode_sync_token(cases_cursor: Optional[str], deleted_cursor: Optional[str]) -> str:
+    payload = json.dumps({"cases": cases_cursor, "deleted": deleted_cursor}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_sync_token(token: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Split a sync token into the case and tombstone cursors it carries"""
+    if not token:
+        return None, None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded))
+        cursors = state["cases"], state["deleted"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Invalid sync token") from e
+    for cursor in cursors:
+        if cursor is not None:
+            decode_cursor(cursor)
+    return cursors
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive UTC timestamps; Postgres aware ones
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def _settled(cursor: Optional[str], settle_point: datetime) -> Optional[str]:
+    """Hold a fully caught-up cursor back to the settle point.
+
+    A write that commits late can carry an updated_at just behind the newest
+    row already returned; replaying the last few seconds on the next sync
+    (clients upsert by case_id) means such writes are never skipped.
+    """
+    if cursor is None:
+        return None
+    timestamp, _ = decode_cursor(cursor)
+    if _utc(timestamp) <= settle_point:
+        return cursor
+    return encode_cursor(settle_point, 0)
+
+async def case_changes(
+    db: AsyncSession,
+    user_id: int,
+    token: Optional[str],
+    limit: int,
+    *options: Any
+) -> ChangeSet:
+    """Cases written and case_ids deleted since `token`, oldest first.
+
+    An empty token starts from the beginning. When has_more is set the client
+    should call again straight away with next_token; otherwise it stores
+    next_token for its next refresh.
+    """
+    cases_cursor, deleted_cursor = decode_sync_token(token)
+    settle_point = datetime.now(timezone.utc) - timedelta(seconds=settings.cases_sync_settle_seconds)
+
+    changed, cases_next = await keyset_page(
+        db, select(Case).options(*options).where(Case.user_id == user_id),
+        Case.updated_at, Case.id, cases_cursor, limit, descending=False
+    )
+    tombstones, deleted_next = await keyset_page(
+        db, select(CaseTombstone).where(CaseTombstone.user_id == user_id),
+        CaseTombstone.deleted_at, CaseTombstone.id, deleted_cursor, limit, descending=False
+    )
+
+    def position(rows, next_cursor, previous, column):
+        if next_cursor:
+            return next_cursor
+        if rows:
+            return _settled(encode_cursor(getattr(rows[-1], column), rows[-1].id), settle_point)
+        return _settled(previous, settle_point)
+
+    return ChangeSet(
+        changed=changed,
+        deleted=[tombstone.case_id for tombstone in tombstones],
+        next_token=encode_sync_token(
+            position(changed, cases_next, cases_cursor, "updated_at"),
+            position(tombstones, deleted_next, deleted_cursor, "deleted_at")
+        ),
+        has_more=bool(cases_next or deleted_next)
+    )
@@ -1,5 +1,25 @@
 import 'feedback.dart';
 
+/// Renders a next step as Markdown. The API sends structured steps as
+/// {step, actions, timeline} objects; older cases and user-edited steps are
+/// plain strings.
+String formatNextStep(dynamic step) {
+  if (step is! Map) return step.toString();
+  final buffer = StringBuffer('**${step['step'] ?? ''}**');
+  final timeline = step['timeline'];
+  if (timeline != null && timeline.toString().isNotEmpty) {
+    buffer.write(' _($timeline)_');
+  }
+  final actions = step['actions'] as List<dynamic>? ?? [];
+  if (actions.isNotEmpty) {
+    buffer.write('\n');
+    for (final action in actions) {
+      buffer.write('\n- $action');
+    }
+  }
+  return buffer.toString();
+}
+
 class Case {
   final String id;
   final String title;
@@ -44,8 +64,7 @@ class Case {
         Map<String, dynamic>.from(law as Map)).toList() ?? [],
       suggestedNGOs: (json['suggested_ngos'] as List<dynamic>?)?.map((ngo) => 
         Map<String, dynamic>.from(ngo as Map)).toList() ?? [],
-      nextSteps: (json['next_steps'] as List<dynamic>?)?.map((step) => 
-        step.toString()).toList() ?? [],
+      nextSteps: (json['next_steps'] as List<dynamic>?)?.map(formatNextStep).toList() ?? [],
       feedback: (json['feedback'] as List<dynamic>?)?.map((f) => 
         CaseFeedback.fromJson(f as Map<String, dynamic>)).toList() ?? [],
       createdAt: DateTime.parse(json['created_at'] ?? DateTime.now().toIso8601String()),
@@ -37,16 +37,22 @@ class CaseProvider with ChangeNotifier {
 
     try {
       print('CaseProvider: Loading cases...');
-      final response = await _apiService.getCases();
-      print('CaseProvider: Response received with status ${response.statusCode}');
-      
-      if (response.statusCode != 200) {
-        _error = 'Server error: ${response.statusCode}';
-        print('CaseProvider: Error - $_error');
-        return;
-      }
+      // Follow X-Next-Cursor until the last page so every case is loaded
+      final List<dynamic> data = [];
+      String? cursor;
+      do {
+        final response = await _apiService.getCases(cursor: cursor);
+        print('CaseProvider: Response received with status ${response.statusCode}');
+        
+        if (response.statusCode != 200) {
+          _error = 'Server error: ${response.statusCode}';
+          print('CaseProvider: Error - $_error');
+          return;
+        }
 
-      final List<dynamic> data = jsonDecode(response.body);
+        data.addAll(jsonDecode(response.body) as List<dynamic>);
+        cursor = response.headers['x-next-cursor'];
+      } while (cursor != null);
       print('CaseProvider: Parsed ${data.length} cases from response');
       
       _cases = [];
@@ -189,7 +195,7 @@ class CaseProvider with ChangeNotifier {
       final response = await _apiService.getNextSteps(caseId);
       if (response.statusCode == 200) {
         final data = json.decode(response.body);
-        return List<String>.from(data['steps']);
+        return (data['steps'] as List<dynamic>).map(formatNextStep).toList();
       }
       _error = 'Failed to load next steps';
       return [];
@@ -56,11 +56,18 @@ class ApiService {
   }
 
   // Case endpoints
-  Future<http.Response> getCases() async {
+  // GET /cases/ is paginated: pass the X-Next-Cursor header of one page as
+  // [cursor] to fetch the next; the last page has no X-Next-Cursor.
+  static const int casesPageSize = 100;
+
+  Future<http.Response> getCases({String? cursor}) async {
     print('API: Getting cases...');
     try {
     final response = await http.get(
-      Uri.parse('$baseUrl/cases/'),
+      Uri.parse('$baseUrl/cases/').replace(queryParameters: {
+        'limit': '$casesPageSize',
+        if (cursor != null) 'cursor': cursor,
+      }),
       headers: await _getAuthHeaders(),
     );
     print('API: Get cases response status: ${response.statusCode}');
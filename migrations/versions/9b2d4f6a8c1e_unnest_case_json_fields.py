@@ -0,0 +1,83 @@
+"""Un-nest double-encoded JSON fields on cases
+
+Revision ID: 9b2d4f6a8c1e
+Revises: 3e9e5c7d85d3
+Create Date: 2025-06-20 10:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d4f6a8c1e'
+down_revision: Union[str, None] = '3e9e5c7d85d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = ('applicable_laws', 'suggested_ngos', 'next_steps')
+BATCH_SIZE = 500
+
+cases = sa.table(
+    'cases',
+    sa.column('id', sa.Integer),
+    *(sa.column(name, sa.JSON) for name in JSON_COLUMNS)
+)
+
+
+def _decode(value):
+    """Strip every layer of string encoding from a stored JSON value"""
+    while isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+    return value
+
+
+def _rewrite(transform) -> None:
+    """Apply `transform` to the JSON columns of every case, in id-ordered batches"""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(cases).where(cases.c.id > last_id).order_by(cases.c.id).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            values = {name: transform(getattr(row, name)) for name in JSON_COLUMNS}
+            if any(values[name] != getattr(row, name) for name in JSON_COLUMNS):
+                bind.execute(cases.update().where(cases.c.id == row.id).values(**values))
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rewrite(_decode)
+    if op.get_bind().dialect.name == 'postgresql':
+        for name in JSON_COLUMNS:
+            op.alter_column(
+                'cases', name,
+                existing_type=sa.JSON(),
+                type_=postgresql.JSONB(),
+                postgresql_using=f'{name}::jsonb'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        for name in JSON_COLUMNS:
+            op.alter_column(
+                'cases', name,
+                existing_type=postgresql.JSONB(),
+                type_=sa.JSON(),
+                postgresql_using=f'{name}::json'
+            )
+    # Restore the string-encoded values the previous application code expects
+    _rewrite(lambda value: json.dumps(value) if value is not None and not isinstance(value, str) else value)
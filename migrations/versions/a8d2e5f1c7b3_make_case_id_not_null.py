@@ -0,0 +1,70 @@
+"""Make cases.case_id NOT NULL with a generated default
+
+Revision ID: a8d2e5f1c7b3
+Revises: f3c6a9d1e4b8
+Create Date: 2025-06-26 10:00:00.000000
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import new_uuid
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d2e5f1c7b3'
+down_revision: Union[str, None] = 'f3c6a9d1e4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+cases = sa.table(
+    'cases',
+    sa.column('id', sa.Integer),
+    sa.column('case_id', sa.String)
+)
+
+
+def _backfill_stragglers() -> None:
+    """Give any case still missing a case_id one, in id-ordered batches.
+
+    Large tables should be backfilled beforehand with
+    `python -m app.scripts.fix_case_ids`; this only catches rows written since.
+    """
+    bind = op.get_bind()
+    missing = sa.or_(cases.c.case_id.is_(None), cases.c.case_id == '')
+    statement = cases.update().where(cases.c.id == sa.bindparam('row_id')).values(case_id=sa.bindparam('new_case_id'))
+    while True:
+        ids = bind.execute(
+            sa.select(cases.c.id).where(missing).order_by(cases.c.id).limit(BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        bind.execute(statement, [{'row_id': row_id, 'new_case_id': str(uuid.uuid4())} for row_id in ids])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _backfill_stragglers()
+    with op.batch_alter_table('cases') as batch_op:
+        batch_op.alter_column(
+            'case_id',
+            existing_type=sa.String(),
+            nullable=False,
+            server_default=new_uuid()
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cases') as batch_op:
+        batch_op.alter_column(
+            'case_id',
+            existing_type=sa.String(),
+            nullable=True,
+            server_default=None
+        )
@@ -0,0 +1,48 @@
+"""Add full-text search over case title, description and draft
+
+Revision ID: c2f8e4a1b6d9
+Revises: a8d2e5f1c7b3
+Create Date: 2025-06-27 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.case_search import SQLITE_FTS_CREATE, SQLITE_FTS_DROP, SQLITE_FTS_REBUILD, search_document
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8e4a1b6d9'
+down_revision: Union[str, None] = 'a8d2e5f1c7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# NOTE: on SQLite the index is kept current by triggers on `cases`. A later
+# batch_alter_table('cases') rebuilds the table and drops them, so such a
+# migration must re-run SQLITE_FTS_CREATE and SQLITE_FTS_REBUILD afterwards.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # Expression index, so Postgres maintains it without triggers
+        with op.get_context().autocommit_block():
+            op.create_index('idx_cases_search', 'cases', [search_document], unique=False,
+                            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for statement in SQLITE_FTS_CREATE:
+            op.execute(statement)
+        # Index the cases that already exist
+        op.execute(SQLITE_FTS_REBUILD)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('idx_cases_search', table_name='cases', postgresql_concurrently=True, if_exists=True)
+    else:
+        for statement in SQLITE_FTS_DROP:
+            op.execute(statement)
@@ -0,0 +1,28 @@
+"""Add (user_id, created_at, id) index for case pagination
+
+Revision ID: c4e8a1d2f5b7
+Revises: 9b2d4f6a8c1e
+Create Date: 2025-06-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1d2f5b7'
+down_revision: Union[str, None] = '9b2d4f6a8c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_cases_user_created_id', 'cases', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cases_user_created_id', table_name='cases')
@@ -0,0 +1,53 @@
+"""Add composite indexes for case status and feedback lookups
+
+Revision ID: d7f3b9e2a6c4
+Revises: c4e8a1d2f5b7
+Create Date: 2025-06-23 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b9e2a6c4'
+down_revision: Union[str, None] = 'c4e8a1d2f5b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('idx_case_user_status', 'cases', ['user_id', 'status']),
+    ('idx_case_status', 'cases', ['status']),
+    ('idx_feedback_case_rating', 'feedback', ['case_id', 'rating']),
+)
+
+
+def _online() -> bool:
+    # Postgres builds the indexes CONCURRENTLY so writes keep flowing; that
+    # cannot run inside the migration transaction
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if _online():
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _online():
+        with op.get_context().autocommit_block():
+            for name, table, _ in INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True)
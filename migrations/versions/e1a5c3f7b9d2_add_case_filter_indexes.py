@@ -0,0 +1,64 @@
+"""Add (user_id, status|category, created_at, id) indexes for filtered case listings
+
+Revision ID: e1a5c3f7b9d2
+Revises: d7f3b9e2a6c4
+Create Date: 2025-06-24 10:00:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a5c3f7b9d2'
+down_revision: Union[str, None] = 'd7f3b9e2a6c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_INDEXES = (
+    ('idx_case_user_status_created', ['user_id', 'status', 'created_at', 'id']),
+    ('idx_case_user_category_created', ['user_id', 'category', 'created_at', 'id']),
+)
+# A leading prefix of idx_case_user_status_created, so it becomes redundant
+REPLACED_INDEX = ('idx_case_user_status', ['user_id', 'status'])
+
+
+def _create(name, columns, online):
+    op.create_index(name, 'cases', columns, unique=False, if_not_exists=True,
+                    **({'postgresql_concurrently': True} if online else {}))
+
+
+def _drop(name, online):
+    op.drop_index(name, table_name='cases', if_exists=True,
+                  **({'postgresql_concurrently': True} if online else {}))
+
+
+def _online() -> bool:
+    # Postgres builds the indexes CONCURRENTLY so writes keep flowing; that
+    # cannot run inside the migration transaction
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def _block(online):
+    return op.get_context().autocommit_block() if online else nullcontext()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    online = _online()
+    with _block(online):
+        for name, columns in NEW_INDEXES:
+            _create(name, columns, online)
+        _drop(REPLACED_INDEX[0], online)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    online = _online()
+    with _block(online):
+        _create(*REPLACED_INDEX, online)
+        for name, _ in NEW_INDEXES:
+            _drop(name, online)
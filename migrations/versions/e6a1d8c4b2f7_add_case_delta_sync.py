@@ -0,0 +1,65 @@
+"""Add case tombstones and updated_at tracking for delta sync
+
+Revision ID: e6a1d8c4b2f7
+Revises: c2f8e4a1b6d9
+Create Date: 2025-06-28 10:00:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1d8c4b2f7'
+down_revision: Union[str, None] = 'c2f8e4a1b6d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+cases = sa.table(
+    'cases',
+    sa.column('created_at', sa.DateTime(timezone=True)),
+    sa.column('updated_at', sa.DateTime(timezone=True))
+)
+
+
+def _online() -> bool:
+    # Postgres builds the index CONCURRENTLY so writes keep flowing; that
+    # cannot run inside the migration transaction
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases first started before migrations ran may already have the table
+    if not sa.inspect(op.get_bind()).has_table('case_tombstones'):
+        op.create_table(
+            'case_tombstones',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('case_id', sa.String(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('idx_case_tombstone_user_deleted', 'case_tombstones', ['user_id', 'deleted_at', 'id'], unique=False,
+                    if_not_exists=True)
+
+    # Rows never updated have no updated_at; they were last written when created
+    op.execute(cases.update().where(cases.c.updated_at.is_(None)).values(updated_at=cases.c.created_at))
+
+    online = _online()
+    with op.get_context().autocommit_block() if online else nullcontext():
+        op.create_index('idx_case_user_updated', 'cases', ['user_id', 'updated_at', 'id'], unique=False,
+                        if_not_exists=True, **({'postgresql_concurrently': True} if online else {}))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    online = _online()
+    with op.get_context().autocommit_block() if online else nullcontext():
+        op.drop_index('idx_case_user_updated', table_name='cases', if_exists=True,
+                      **({'postgresql_concurrently': True} if online else {}))
+    op.drop_index('idx_case_tombstone_user_deleted', table_name='case_tombstones')
+    op.drop_table('case_tombstones')
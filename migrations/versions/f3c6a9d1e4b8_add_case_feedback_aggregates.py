@@ -0,0 +1,53 @@
+"""Add feedback count and rating total to cases
+
+Revision ID: f3c6a9d1e4b8
+Revises: e1a5c3f7b9d2
+Create Date: 2025-06-25 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c6a9d1e4b8'
+down_revision: Union[str, None] = 'e1a5c3f7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+cases = sa.table(
+    'cases',
+    sa.column('case_id', sa.String),
+    sa.column('feedback_count', sa.Integer),
+    sa.column('feedback_rating_total', sa.Integer)
+)
+feedback = sa.table(
+    'feedback',
+    sa.column('case_id', sa.String),
+    sa.column('rating', sa.Integer)
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('cases') as batch_op:
+        batch_op.add_column(sa.Column('feedback_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('feedback_rating_total', sa.Integer(), nullable=False, server_default='0'))
+
+    # Older schemas typed feedback.case_id as an integer; compare as text
+    matches = sa.cast(feedback.c.case_id, sa.String) == cases.c.case_id
+    op.execute(
+        cases.update().values(
+            feedback_count=sa.select(sa.func.count()).where(matches).scalar_subquery(),
+            feedback_rating_total=sa.select(sa.func.coalesce(sa.func.sum(feedback.c.rating), 0)).where(matches).scalar_subquery()
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cases') as batch_op:
+        batch_op.drop_column('feedback_rating_total')
+        batch_op.drop_column('feedback_count')
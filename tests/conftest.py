@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.auth.dependencies import get_current_active_user
+from app.database import Base, get_async_db
+from app.responses import upstream_unavailable_handler
+from app.routes.case_routes import router
+from app.services.resilience import UpstreamUnavailableError
+
+@pytest_asyncio.fixture
+async def engine():
+    """Fresh in-memory database per test"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest_asyncio.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+@pytest.fixture
+def seed_cases():
+    """Rows inserted before `client` is handed out; modules override this"""
+    return []
+
+@pytest_asyncio.fixture
+async def client(engine, seed_cases):
+    """HTTP client for the case routes on the test database, signed in as user 1"""
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_exception_handler(UpstreamUnavailableError, upstream_unavailable_handler)
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[get_current_active_user] = lambda: SimpleNamespace(id=1, location="Mumbai")
+    async with Session() as db:
+        db.add_all(seed_cases)
+        await db.commit()
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
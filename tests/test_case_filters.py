@@ -0,0 +1,75 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select, text, update
+
+from app.models import Case
+from app.routes.case_routes import CaseFilters
+
+CASES = [
+    ("a", "pending", "Labour Law", datetime(2025, 1, 5)),
+    ("b", "resolved", "Labour Law", datetime(2025, 2, 5)),
+    ("c", "pending", "Family Law", datetime(2025, 3, 5)),
+    ("d", "pending", "Consumer Protection", datetime(2025, 4, 5)),
+]
+
+@pytest.fixture
+def seed_cases():
+    rows = [
+        Case(case_id=case_id, title=case_id, description="d", category=category,
+             status=status, user_id=1, created_at=created_at)
+        for case_id, status, category, created_at in CASES
+    ]
+    rows.append(Case(case_id="other-user", title="x", description="d", category="Labour Law",
+                     status="pending", user_id=2, created_at=datetime(2025, 1, 1)))
+    return rows
+
+async def _ids(client, query):
+    response = await client.get(f"/cases/?{query}")
+    assert response.status_code == 200
+    return [case["case_id"] for case in response.json()]
+
+@pytest.mark.asyncio
+async def test_filters_narrow_the_listing(client):
+    assert await _ids(client, "status=pending") == ["d", "c", "a"]
+    assert await _ids(client, "status=pending&category=Labour%20Law") == ["a"]
+    assert await _ids(client, "created_after=2025-02-05T00:00:00&created_before=2025-04-05T00:00:00") == ["c", "b"]
+    assert await _ids(client, "created_after=2025-03-01T00:00:00%2B05:30") == ["d", "c"]
+
+@pytest.mark.asyncio
+async def test_oldest_first_pages_with_cursor(client):
+    first = await client.get("/cases/?sort=oldest&status=pending&limit=2")
+    assert [case["case_id"] for case in first.json()] == ["a", "c"]
+    cursor = first.headers["X-Next-Cursor"]
+    assert await _ids(client, f"sort=oldest&status=pending&limit=2&cursor={cursor}") == ["d"]
+
+@pytest.mark.asyncio
+async def test_counts_by_status_and_category(client):
+    response = await client.get("/cases/counts")
+    assert response.json() == {
+        "total": 4,
+        "by_status": {"pending": 3, "resolved": 1},
+        "by_category": {"Labour Law": 2, "Family Law": 1, "Consumer Protection": 1}
+    }
+    assert (await client.get("/cases/counts?created_after=2025-03-01T00:00:00")).json()["total"] == 2
+
+@pytest.mark.asyncio
+async def test_counts_label_missing_status_and_category(client, db):
+    db.add(Case(case_id="legacy", title="legacy", description="d", category=None, user_id=1))
+    await db.commit()
+    # PATCH {"status": null} clears the status of an existing case
+    await db.execute(update(Case).where(Case.case_id == "legacy").values(status=None))
+    await db.commit()
+    counts = (await client.get("/cases/counts")).json()
+    assert counts["total"] == 5
+    assert counts["by_status"]["unknown"] == 1
+    assert counts["by_category"]["uncategorized"] == 1
+
+@pytest.mark.asyncio
+async def test_status_filter_uses_composite_index(engine):
+    query = CaseFilters(status="pending").apply(select(Case.id).where(Case.user_id == 1), "sqlite")
+    query = query.order_by(Case.created_at.desc(), Case.id.desc())
+    compiled = query.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+    async with engine.connect() as conn:
+        plan = " ".join(str(row) for row in (await conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all())
+    assert "idx_case_user_status_created" in plan
+    assert "TEMP B-TREE" not in plan
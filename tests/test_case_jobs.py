@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.models.case import Case
+from app.models.case_tombstone import CaseTombstone
+from app.models.case_schema import CaseCreate
+from app.models.user_schema import UserResponse
+from app.routes import case_routes
+from app.services.case_jobs import CaseJobQueue, InProcessJobBackend, JobBackend, JobQueueFullError
+
+@pytest.mark.asyncio
+async def test_workers_process_enqueued_and_recovered_jobs():
+    """Queued jobs and jobs recovered at startup are all handled"""
+    handled = []
+
+    async def handler(case_id):
+        handled.append(case_id)
+
+    backend = InProcessJobBackend(maxsize=10)
+    queue = CaseJobQueue(handler=handler, backend=backend, workers=2)
+    await queue.start(recovered_job_ids=["recovered-1"])
+    queue.enqueue("new-1")
+    await asyncio.sleep(0.01)
+    await backend.queue.join()
+    await queue.stop()
+    assert sorted(handled) == ["new-1", "recovered-1"]
+    assert queue.get_stats()["completed_total"] == 2
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_jobs():
+    """Enqueueing beyond capacity fails fast instead of blocking the request"""
+    async def handler(case_id):
+        pass
+
+    queue = CaseJobQueue(handler=handler, backend=InProcessJobBackend(maxsize=1), workers=1)
+    queue.enqueue("first")
+    with pytest.raises(JobQueueFullError):
+        queue.enqueue("second")
+
+def test_backend_must_implement_every_method():
+    """A backend missing a method fails when instantiated, not mid-job"""
+    class Incomplete(JobBackend):
+        def put_nowait(self, job_id):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+@pytest.mark.asyncio
+async def test_rejected_background_case_is_not_kept(db, monkeypatch):
+    """A case refused by a full queue is removed without a tombstone, so the client's retry leaves no trace"""
+    async def handler(case_id):
+        pass
+
+    queue = CaseJobQueue(handler=handler, backend=InProcessJobBackend(maxsize=1), workers=1)
+    queue.enqueue("queued")
+    monkeypatch.setattr(case_routes, "case_job_queue", queue)
+    user = UserResponse(
+        id=1, email="a@example.com", username="a", full_name="A",
+        is_active=True, created_at=datetime.now(timezone.utc)
+    )
+    with pytest.raises(HTTPException) as error:
+        await case_routes._enqueue_case(CaseCreate(title="t", description="d", category="c"), user, db)
+    assert error.value.status_code == 503
+    assert (await db.execute(select(func.count(Case.id)))).scalar_one() == 0
+    assert (await db.execute(select(func.count(CaseTombstone.id)))).scalar_one() == 0
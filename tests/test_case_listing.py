@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Case
+from app.routes import case_routes
+
+@pytest.fixture
+def seed_cases():
+    return [
+        Case(case_id="with-draft", title="Wages", description="Unpaid wages", category="Labour Law",
+             status="pending", user_id=1, generated_draft="x" * 5000,
+             applicable_laws=[{"act": "Payment of Wages Act, 1936"}], next_steps=["File a claim"]),
+        Case(title="Legacy", description="Old row", category="Family Law", status="pending", user_id=1),
+    ]
+
+@pytest.mark.asyncio
+async def test_listing_returns_summaries_without_large_columns(client, engine):
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    response = await client.get("/cases/")
+    assert response.status_code == 200
+    cases = response.json()
+    assert {case["title"] for case in cases} == {"Wages", "Legacy"}
+    assert all(case["case_id"] for case in cases)
+    assert all("generated_draft" not in case and "next_steps" not in case for case in cases)
+    assert not any("generated_draft" in statement or "applicable_laws" in statement for statement in statements)
+    assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+
+@pytest.mark.asyncio
+async def test_detail_still_returns_full_case(client):
+    case = (await client.get("/cases/with-draft")).json()
+    assert len(case["generated_draft"]) == 5000
+    assert case["applicable_laws"] == [{"act": "Payment of Wages Act, 1936"}]
+
+@pytest.mark.asyncio
+async def test_write_paths_return_loaded_cases(client, monkeypatch):
+    """Create, update and feedback responses need no lazy loads on the async session"""
+    async def fake_process_case(**kwargs):
+        return {"draft": "Draft", "applicable_laws": [], "suggested_ngos": [], "next_steps": []}
+
+    monkeypatch.setattr(case_routes.legal_agent, "process_case", fake_process_case)
+    created = await client.post("/cases/", json={"title": "New", "description": "d", "category": "c"})
+    assert created.status_code == 200
+    case_id = created.json()["case_id"]
+    assert created.json()["feedback"] == []
+
+    feedback = await client.post(f"/cases/{case_id}/feedback", json={"case_id": case_id, "rating": 5})
+    assert feedback.status_code == 200
+    updated = await client.patch(f"/cases/{case_id}", json={"status": "resolved"})
+    assert updated.json()["status"] == "resolved"
+    assert [item["rating"] for item in updated.json()["feedback"]] == [5]
+
+@pytest.mark.asyncio
+async def test_feedback_aggregates_and_constant_listing_queries(client, engine):
+    for rating in (5, 2):
+        response = await client.post("/cases/with-draft/feedback", json={"case_id": "with-draft", "rating": rating})
+        assert response.status_code == 200
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    listed = {case["case_id"]: case for case in (await client.get("/cases/")).json()}
+    listing_queries = len(statements)
+    assert listed["with-draft"]["feedback_count"] == 2
+    assert listed["with-draft"]["average_rating"] == 3.5
+    assert listed[next(key for key in listed if key != "with-draft")]["average_rating"] is None
+    assert not any("FROM feedback" in statement for statement in statements)
+
+    async with async_sessionmaker(engine)() as db:
+        for i in range(10):
+            db.add(Case(case_id=f"extra-{i}", title="t", description="d", category="c", status="pending", user_id=1))
+        await db.commit()
+    statements.clear()
+    assert len((await client.get("/cases/")).json()) == 12
+    assert len(statements) == listing_queries
+
+    detail = (await client.get("/cases/with-draft")).json()
+    assert [item["rating"] for item in detail["feedback"]] == [5, 2]
+    assert detail["average_rating"] == 3.5
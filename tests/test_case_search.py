@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import Case
+
+@pytest.fixture
+def seed_cases():
+    return [
+        Case(case_id="landlord-title", title="Landlord withholding deposit", description="Tenancy ended in May",
+             category="Property Law", status="pending", user_id=1),
+        Case(case_id="landlord-draft", title="Rent receipt", description="Receipts were never issued",
+             category="Property Law", status="pending", user_id=1,
+             generated_draft="Notice to the landlord under the Rent Control Act"),
+        Case(case_id="wages", title="Unpaid wages", description="Employer stopped paying salary",
+             category="Labour Law", status="pending", user_id=1),
+        Case(case_id="other-user", title="Landlord dispute", description="Not mine",
+             category="Property Law", status="pending", user_id=2),
+        Case(case_id="markup", title="<script>alert(1)</script> eviction", description="Eviction <b>notice</b> & threats",
+             category="Property Law", status="pending", user_id=1),
+    ]
+
+async def _search(client, query):
+    response = await client.get("/cases/search", params=query)
+    assert response.status_code == 200
+    return response
+
+@pytest.mark.asyncio
+async def test_results_are_ranked_highlighted_and_scoped_to_user(client):
+    hits = (await _search(client, {"q": "landlord"})).json()
+    assert [hit["case_id"] for hit in hits] == ["landlord-title", "landlord-draft"]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert hits[0]["title_highlight"] == "<mark>Landlord</mark> withholding deposit"
+    assert "<mark>landlord</mark>" in hits[1]["snippet"]
+    assert "generated_draft" not in hits[0]
+
+@pytest.mark.asyncio
+async def test_highlights_escape_case_text(client):
+    """Only the match markers come back as markup; user text is HTML-escaped"""
+    hit = (await _search(client, {"q": "eviction"})).json()[0]
+    assert hit["title_highlight"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>eviction</mark>"
+    hit = (await _search(client, {"q": "threats"})).json()[0]
+    assert hit["snippet"] == "Eviction &lt;b&gt;notice&lt;/b&gt; &amp; <mark>threats</mark>"
+
+@pytest.mark.asyncio
+async def test_prefix_stemming_and_query_syntax_are_handled(client):
+    assert [hit["case_id"] for hit in (await _search(client, {"q": "unpaid sal"})).json()] == ["wages"]
+    assert [hit["case_id"] for hit in (await _search(client, {"q": "pays"})).json()] == ["wages"]
+    assert (await _search(client, {"q": '"landlord* (deposit'})).json()[0]["case_id"] == "landlord-title"
+    assert (await _search(client, {"q": "!!!"})).json() == []
+
+@pytest.mark.asyncio
+async def test_index_follows_updates(client, engine):
+    async with async_sessionmaker(engine)() as db:
+        case = (await db.execute(select(Case).where(Case.case_id == "wages"))).scalar_one()
+        case.title = "Gratuity claim"
+        await db.commit()
+    assert (await _search(client, {"q": "wages"})).json() == []
+    assert [hit["case_id"] for hit in (await _search(client, {"q": "gratuity"})).json()] == ["wages"]
+    # Status changes leave the indexed text alone
+    await client.patch("/cases/wages", json={"status": "resolved"})
+    assert [hit["case_id"] for hit in (await _search(client, {"q": "gratuity"})).json()] == ["wages"]
+
+@pytest.mark.asyncio
+async def test_results_page_by_offset(client):
+    first = await _search(client, {"q": "landlord", "limit": 1})
+    assert first.headers["X-Next-Offset"] == "1"
+    second = await _search(client, {"q": "landlord", "limit": 1, "offset": 1})
+    assert [hit["case_id"] for hit in second.json()] == ["landlord-draft"]
+    assert "X-Next-Offset" not in second.headers
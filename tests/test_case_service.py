@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import StatementError
+from types import SimpleNamespace
+from sqlalchemy import func, select
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import Base, create_db_engine, get_pool_stats
+from app.models import Case
+from app.models.case_schema import CaseCreate
+from app.services import case_service
+from app.services.case_service import apply_agent_response, process_case_batch, process_case_job
+
+class FakeAgent:
+    async def process_case(self, title, description, category, location):
+        if title == "bad":
+            raise ValueError("agent failure")
+        return {
+            "draft": f"Draft for {title}",
+            "applicable_laws": [],
+            "suggested_ngos": [],
+            "next_steps": ["File a complaint"]
+        }
+
+@pytest.mark.asyncio
+async def test_batch_reports_per_item_results(db):
+    """Successful items are bulk inserted and failures are reported per item"""
+    user = SimpleNamespace(id=1, location="Mumbai")
+    items = [
+        CaseCreate(title=title, description="Details", category="Consumer Protection")
+        for title in ["one", "bad", "three"]
+    ]
+    results = await process_case_batch(items, user, FakeAgent(), db, concurrency=2, chunk_size=2)
+    assert [result["status"] for result in results] == ["created", "error", "created"]
+    assert results[1]["error"] == "agent failure"
+    assert await db.scalar(select(func.count()).select_from(Case)) == 2
+
+@pytest.mark.asyncio
+async def test_json_fields_are_stored_natively(db):
+    """JSON columns hold arrays, not JSON-encoded strings, and read back as lists"""
+    case = Case(case_id="native", title="t", description="d", category="c", user_id=1)
+    apply_agent_response(case, {
+        "draft": "Draft",
+        "applicable_laws": [{"act": "Consumer Protection Act, 2019"}],
+        "suggested_ngos": [],
+        "next_steps": [{"step": "File a complaint", "actions": [], "timeline": None}]
+    })
+    db.add(case)
+    await db.commit()
+    raw = await db.scalar(text("SELECT applicable_laws FROM cases WHERE case_id = 'native'"))
+    assert raw.startswith("[")
+    db.expire_all()
+    stored = (await db.execute(select(Case).where(Case.case_id == "native"))).scalars().one()
+    assert stored.applicable_laws == [{"act": "Consumer Protection Act, 2019"}]
+    assert stored.suggested_ngos == []
+
+@pytest.mark.asyncio
+async def test_json_fields_reject_encoded_strings(db):
+    db.add(Case(case_id="encoded", title="t", description="d", category="c", next_steps='["step"]'))
+    with pytest.raises(StatementError):
+        await db.commit()
+
+@pytest.mark.asyncio
+async def test_case_job_holds_no_connection_while_the_agent_runs(tmp_path, monkeypatch):
+    """The agent call runs outside any transaction, so the result is stamped when written"""
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}", is_async=True)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(case_service, "AsyncSessionLocal", Session)
+        async with Session() as db:
+            db.add(Case(case_id="queued", title="one", description="d", category="c", status="processing", user_id=1))
+            db.add(Case(case_id="failing", title="bad", description="d", category="c", status="processing", user_id=1))
+            await db.commit()
+
+        checked_out = []
+
+        class WatchingAgent(FakeAgent):
+            async def process_case(self, **kwargs):
+                checked_out.append(get_pool_stats(engine)["checked_out"])
+                return await super().process_case(**kwargs)
+
+        await process_case_job("queued", WatchingAgent())
+        await process_case_job("failing", WatchingAgent())
+        assert checked_out == [0, 0]
+        async with Session() as db:
+            statuses = dict((await db.execute(select(Case.case_id, Case.status))).all())
+        assert statuses == {"queued": "pending", "failing": "failed"}
+    finally:
+        await engine.dispose()
@@ -0,0 +1,61 @@
+import pytest
+from datetime import datetime
+
+from app.models import Case
+
+@pytest.fixture
+def seed_cases():
+    rows = [
+        Case(case_id=f"case-{day}", title=f"Case {day}", description="d", category="c",
+             status="pending", user_id=1, created_at=datetime(2025, 1, day), updated_at=datetime(2025, 1, day))
+        for day in range(1, 4)
+    ]
+    rows.append(Case(case_id="other-user", title="x", description="d", category="c", status="pending", user_id=2))
+    return rows
+
+async def _changes(client, since=None, **params):
+    response = await client.get("/cases/changes", params={**params, **({"since": since} if since else {})})
+    assert response.status_code == 200
+    return response.json()
+
+@pytest.mark.asyncio
+async def test_delta_sync_returns_only_writes_and_deletions_since_token(client):
+    first = await _changes(client, limit=2)
+    assert [case["case_id"] for case in first["changed"]] == ["case-1", "case-2"]
+    assert first["has_more"]
+    full = await _changes(client, first["next_token"], limit=2)
+    assert [case["case_id"] for case in full["changed"]] == ["case-3"]
+    assert not full["has_more"]
+
+    assert (await _changes(client, full["next_token"]))["changed"] == []
+
+    await client.patch("/cases/case-1", json={"status": "resolved"})
+    assert (await client.delete("/cases/case-2")).status_code == 204
+    delta = await _changes(client, full["next_token"])
+    assert [(case["case_id"], case["status"]) for case in delta["changed"]] == [("case-1", "resolved")]
+    assert delta["deleted"] == ["case-2"]
+    # Writes inside the settle window are replayed rather than risk being skipped
+    assert (await _changes(client, delta["next_token"]))["deleted"] == ["case-2"]
+
+@pytest.mark.asyncio
+async def test_bad_sync_token_is_rejected(client):
+    response = await client.get("/cases/changes", params={"since": "not-a-token"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_detail_and_listing_answer_if_none_match_with_304(client):
+    for path in ("/cases/case-3", "/cases/?limit=2"):
+        first = await client.get(path)
+        etag = first.headers["ETag"]
+        assert first.status_code == 200 and first.json()
+        repeat = await client.get(path, headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+        assert repeat.headers["ETag"] == etag
+
+    assert (await client.get("/cases/?limit=2", headers={"If-None-Match": etag})).headers["X-Next-Cursor"]
+    detail_etag = (await client.get("/cases/case-3")).headers["ETag"]
+    await client.patch("/cases/case-3", json={"status": "resolved"})
+    changed = await client.get("/cases/case-3", headers={"If-None-Match": detail_etag})
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "resolved"
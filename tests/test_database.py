@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import create_db_engine, get_pool_stats
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_applies_pragmas_and_tracks_checkouts(tmp_path):
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}", is_async=True)
+    try:
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert get_pool_stats(engine)["checked_out"] == 1
+        stats = get_pool_stats(engine)
+        assert stats["checked_out"] == 0
+        assert stats["checkouts_total"] == 1
+        assert stats["connections_total"] == 1
+        assert stats["max_overflow"] == settings.db_max_overflow
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_wait_instead_of_failing(tmp_path):
+    """busy_timeout serialises writers rather than raising 'database is locked'"""
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'writers.db'}", is_async=True)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)"))
+
+        async def write(index):
+            async with engine.begin() as conn:
+                for row in range(20):
+                    await conn.execute(text("INSERT INTO items (value) VALUES (:value)"), {"value": f"{index}-{row}"})
+
+        await asyncio.gather(*(write(index) for index in range(10)))
+        async with engine.connect() as conn:
+            assert (await conn.execute(text("SELECT COUNT(*) FROM items"))).scalar() == 200
+    finally:
+        await engine.dispose()
@@ -0,0 +1,32 @@
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.scripts.fix_case_ids import backfill_case_ids
+
+def _migrate(engine, revision):
+    config = Config("alembic.ini")
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, revision)
+
+def test_backfill_runs_in_batches_then_case_id_becomes_not_null(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    _migrate(engine, "f3c6a9d1e4b8")
+    with engine.begin() as conn:
+        for i in range(5):
+            case_id = "kept" if i == 2 else ("" if i == 3 else None)
+            conn.execute(text("INSERT INTO cases (title, case_id) VALUES (:title, :case_id)"), {"title": f"case {i}", "case_id": case_id})
+
+    progress = []
+    assert backfill_case_ids(engine, batch_size=2, progress=lambda *args: progress.append(args)) == 4
+    assert progress == [(2, 4, 2), (4, 4, 5)]
+    assert backfill_case_ids(engine, batch_size=2) == 0
+
+    _migrate(engine, "head")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO cases (title) VALUES ('raw insert')"))
+        case_ids = conn.execute(text("SELECT case_id FROM cases ORDER BY id")).scalars().all()
+    assert case_ids[2] == "kept"
+    assert all(len(case_id) == 36 for i, case_id in enumerate(case_ids) if i != 2)
+    assert len(set(case_ids)) == 6
@@ -1,5 +1,8 @@
+import asyncio
+import httpx
 import pytest
-from app.services.gemini_service import gemini_service
+from app.services.gemini_service import gemini_service, GeminiService
+from app.services.llm_cache import LLMCache, llm_cache
 
 @pytest.mark.asyncio
 async def test_gemini_basic():
@@ -25,4 +28,78 @@ async def test_legal_analysis():
     print("\nLegal Analysis Test:")
     print(f"Test Case: {test_case}")
     print(f"Response: {response}\n")
-    assert response["source"] == "gemini" 
\ No newline at end of file
+    assert response["source"] == "gemini" 
+
+
+@pytest.mark.asyncio
+async def test_gemini_client_is_pooled():
+    """The service reuses one pooled client until shutdown"""
+    service = GeminiService()
+    client = service.client
+    assert service.client is client
+    stats = service.get_pool_stats()
+    assert stats["requests_in_flight"] == 0
+    await service.shutdown()
+    assert client.is_closed
+    assert service.get_pool_stats()["connections"] == 0
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_coalesced(monkeypatch):
+    """Concurrent identical prompts share a single upstream call"""
+    service = GeminiService()
+    calls = []
+
+    async def fake_generate(prompt, response_schema=None):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    monkeypatch.setattr(service, "_generate_content", fake_generate)
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    results = await asyncio.gather(*[service.generate_content("same prompt") for _ in range(5)])
+    assert results == ["ok"] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_ttl_and_lru(tmp_path):
+    """Cached responses expire after their TTL and the oldest entries are evicted"""
+    cache = LLMCache(path=str(tmp_path / "cache.db"), max_entries=2)
+    first = cache.make_key("gemini-2.0-flash", "first")
+    second = cache.make_key("gemini-2.0-flash", "second")
+    third = cache.make_key("gemini-2.0-flash", "third")
+
+    await cache.set(first, "one")
+    await cache.set(second, "two")
+    assert await cache.get(first) == "one"
+    await cache.set(third, "three")
+    assert await cache.get(second) is None
+    assert await cache.get(third) == "three"
+
+    await cache.set(first, "stale", ttl=0)
+    assert await cache.get(first) is None
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_content_yields_chunks(monkeypatch):
+    """Streaming responses are parsed from SSE data lines into text chunks"""
+    body = (
+        'data: {"candidates": [{"content": {"parts": [{"text": "Hello"}]}}]}\r\n\r\n'
+        'data: {"candidates": [{"content": {"parts": [{"text": " world"}]}}]}\r\n\r\n'
+    )
+
+    def handler(request):
+        assert ":streamGenerateContent" in request.url.path
+        return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+    service = GeminiService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    chunks = [chunk async for chunk in service.stream_content("Say hello")]
+    assert chunks == ["Hello", " world"]
+    await service.shutdown()
@@ -1,5 +1,13 @@
+import asyncio
+import time
+
 import pytest
+from app.config import settings
+from app.services import llm
+from app.services.llm_cache import llm_cache
+from app.services.llm_providers import FakeLLMService
 from app.agent.legal_agent import LegalAgent
+from app.agent.tools.ngo_finder import NGOFinderTool
 
 @pytest.mark.asyncio
 async def test_legal_agent():
@@ -34,4 +42,44 @@ async def test_legal_agent():
     
     assert response["title"] == test_case["title"]
     assert "Consumer Protection Act" in response["ai_analysis"]["analysis"]
-    assert chat_response is not None 
\ No newline at end of file
+    assert chat_response is not None
+
+
+@pytest.mark.asyncio
+async def test_process_case_reuses_analysis(monkeypatch):
+    """One case costs one analysis call plus one next-steps call"""
+    provider = FakeLLMService(latency_mean=0, error_rate=0, response_words=20)
+    monkeypatch.setattr(llm, "_provider", provider)
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    agent = LegalAgent()
+    response = await agent.process_case(
+        title="Defective phone",
+        description="The seller refuses to replace a defective smartphone.",
+        category="Consumer Protection",
+        location="Mumbai"
+    )
+    assert provider.calls == 2
+    assert response["analysis"]["source"] == "fake"
+    assert response["analysis"]["structured"]["laws"]
+    assert all(set(step) == {"step", "actions", "timeline"} for step in response["next_steps"])
+
+
+@pytest.mark.asyncio
+async def test_slow_local_stage_times_out(monkeypatch):
+    """A blocking local tool runs off the event loop, so its stage timeout fires"""
+    def slow_run(self, tool_input):
+        time.sleep(0.3)
+        return []
+
+    monkeypatch.setattr(llm, "_provider", FakeLLMService(latency_mean=0, error_rate=0, response_words=20))
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    monkeypatch.setattr(settings, "agent_local_stage_timeout", 0.05)
+    monkeypatch.setattr(NGOFinderTool, "run", slow_run)
+    agent = LegalAgent()
+    with pytest.raises(asyncio.TimeoutError, match="'ngos' timed out"):
+        await agent.process_case(
+            title="Defective phone",
+            description="The seller refuses to replace a defective smartphone.",
+            category="Consumer Protection",
+            location="Mumbai"
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import httpx
+import pytest
+from app.services.gemini_service import GeminiService
+from app.services import llm
+from app.services.llm import create_llm_provider
+from app.services.llm_cache import llm_cache
+from app.services.llm_providers import FakeLLMService, HedgedLLMService
+from app.services.resilience import CircuitBreaker, UpstreamUnavailableError
+
+@pytest.mark.asyncio
+async def test_fake_provider_is_deterministic(monkeypatch):
+    """The same seed and prompt always produce the same response"""
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    first = FakeLLMService(latency_distribution="fixed", latency_mean=0, response_words=30, seed=7)
+    second = FakeLLMService(latency_distribution="fixed", latency_mean=0, response_words=30, seed=7)
+    text = await first.generate_content("prompt")
+    assert text == await second.generate_content("prompt")
+    assert len(text.split()) == 30
+    chunks = [chunk async for chunk in first.stream_content("prompt")]
+    assert "".join(chunks) == text
+
+@pytest.mark.asyncio
+async def test_fake_provider_error_rate(monkeypatch):
+    """An error rate of 1 makes every call fail like an upstream error"""
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    provider = FakeLLMService(latency_mean=0, error_rate=1.0)
+    with pytest.raises(UpstreamUnavailableError):
+        await provider.generate_content("prompt")
+    with pytest.raises(UpstreamUnavailableError):
+        await provider.generate_legal_analysis("Title", "Description", "Category")
+
+@pytest.mark.asyncio
+async def test_injected_errors_return_503(client, monkeypatch):
+    """Routes answer 503 with Retry-After while the fake provider is failing"""
+    monkeypatch.setattr(llm, "_provider", FakeLLMService(latency_mean=0, error_rate=1.0))
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    response = await client.post("/cases/generate", json={
+        "title": "Defective phone",
+        "description": "The seller refuses to replace a defective smartphone.",
+        "category": "Consumer Protection"
+    })
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_unknown_provider_is_rejected():
+    """Provider names are validated"""
+    assert create_llm_provider("fake").name == "fake"
+    with pytest.raises(ValueError):
+        create_llm_provider("unknown")
+
+@pytest.mark.asyncio
+async def test_hedged_request_prefers_faster_secondary(monkeypatch):
+    """A slow primary is hedged and the faster secondary's answer wins"""
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    primary = FakeLLMService(latency_distribution="fixed", latency_mean=0.5, seed=1)
+    secondary = FakeLLMService(latency_distribution="fixed", latency_mean=0.01, seed=2)
+    secondary.name = "backup"
+    hedged = HedgedLLMService(primary, secondary, initial_delay=0.02, max_hedge_rate=1.0)
+    result = await hedged.generate_content("prompt")
+    assert result == await secondary._generate_content("prompt")
+    assert hedged.format_legal_analysis(result)["source"] == "backup"
+    stats = hedged.get_stats()
+    assert stats["hedged_total"] == 1
+    assert stats["win_rate"] == 1.0
+    # The cancelled primary still counts towards the latency percentile
+    await asyncio.sleep(0)
+    assert len(hedged.latencies) == 1
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(monkeypatch):
+    """Primaries answering within the hedge delay never trigger a secondary call"""
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    primary = FakeLLMService(latency_distribution="fixed", latency_mean=0, seed=1)
+    secondary = FakeLLMService(latency_distribution="fixed", latency_mean=0, seed=2)
+    hedged = HedgedLLMService(primary, secondary, initial_delay=1.0)
+    await hedged.generate_content("prompt")
+    assert secondary.calls == 0
+    assert hedged.get_stats()["hedge_rate"] == 0.0
+
+def test_hedged_stats_report_both_providers():
+    """Metrics describe the providers actually in use, not a fixed backend"""
+    hedged = HedgedLLMService(FakeLLMService(seed=1), FakeLLMService(seed=2))
+    stats = hedged.get_stats()
+    assert stats["primary"]["provider"] == "fake"
+    assert stats["secondary"]["provider"] == "fake"
+
+@pytest.mark.asyncio
+async def test_hedge_releases_a_cancelled_primary_probe(monkeypatch):
+    """Cancelling a half-open Gemini probe when the secondary wins keeps the breaker usable"""
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    primary = GeminiService()
+    primary.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    primary.circuit_breaker.record_failure()
+
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    primary._client = httpx.AsyncClient(transport=httpx.MockTransport(hang))
+    secondary = FakeLLMService(latency_distribution="fixed", latency_mean=0, seed=2)
+    hedged = HedgedLLMService(primary, secondary, initial_delay=0.01, max_hedge_rate=1.0)
+    assert await hedged.generate_content("prompt") is not None
+    await asyncio.sleep(0.01)
+    assert primary.circuit_breaker.check() is True
+    await primary.shutdown()
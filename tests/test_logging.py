@@ -0,0 +1,23 @@
+import json
+import logging
+from app import logging_config
+from app.logging_config import JsonFormatter, RequestIdFilter, request_id_var, sample_payload
+
+def test_json_lines_carry_request_id_and_extras():
+    record = logging.makeLogRecord({"name": "app.test", "levelname": "INFO", "msg": "hello %s", "args": ("world",), "attempt": 2})
+    token = request_id_var.set("req-123")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+    line = json.loads(JsonFormatter().format(record))
+    assert line["message"] == "hello world"
+    assert line["request_id"] == "req-123"
+    assert line["attempt"] == 2
+
+def test_large_payloads_are_sampled_and_truncated(monkeypatch):
+    monkeypatch.setattr(logging_config.settings, "log_payload_max_chars", 10)
+    monkeypatch.setattr(logging_config.settings, "log_payload_sample_rate", 1.0)
+    assert sample_payload("x" * 50) == "xxxxxxxxxx... (50 chars)"
+    monkeypatch.setattr(logging_config.settings, "log_payload_sample_rate", 0.0)
+    assert sample_payload("x" * 50) is None
@@ -0,0 +1,41 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select, text
+
+from app.models import Case
+from app.services.pagination import InvalidCursorError, decode_cursor, keyset_page
+
+@pytest.mark.asyncio
+async def test_pages_cover_every_case_once_newest_first(db):
+    """Ties on created_at (server default, second precision) are broken by id"""
+    start = datetime(2025, 1, 1)
+    for i in range(12):
+        db.add(Case(case_id=f"old-{i}", title=f"old {i}", user_id=1, created_at=start + timedelta(minutes=i)))
+    for i in range(13):
+        db.add(Case(case_id=f"new-{i}", title=f"new {i}", user_id=1))
+    db.add(Case(case_id="other", title="other user", user_id=2))
+    await db.commit()
+
+    query = select(Case).where(Case.user_id == 1)
+    seen, cursor = [], None
+    while True:
+        rows, cursor = await keyset_page(db, query, Case.created_at, Case.id, cursor, 10)
+        seen.extend(rows)
+        if cursor is None:
+            break
+    assert len(seen) == 25
+    assert len({case.id for case in seen}) == 25
+    keys = [(case.created_at, case.id) for case in seen]
+    assert keys == sorted(keys, reverse=True)
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+@pytest.mark.asyncio
+async def test_page_query_uses_index(db):
+    plan = (await db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT * FROM cases WHERE user_id = 1 "
+        "ORDER BY created_at DESC, id DESC LIMIT 11"
+    ))).fetchall()
+    assert any("ix_cases_user_created_id" in row[-1] for row in plan)
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from app.agent.pipeline import Stage, StageScheduler
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    """Independent stages overlap and dependents receive their inputs"""
+    async def slow(value):
+        await asyncio.sleep(0.05)
+        return value
+
+    async def first():
+        return await slow(1)
+
+    async def second():
+        return await slow(2)
+
+    async def combined(first, second):
+        return first + second
+
+    scheduler = StageScheduler([
+        Stage("first", first),
+        Stage("second", second),
+        Stage("combined", combined, depends_on=["first", "second"])
+    ])
+    start = asyncio.get_event_loop().time()
+    results = await scheduler.run()
+    elapsed = asyncio.get_event_loop().time() - start
+    assert results == {"first": 1, "second": 2, "combined": 3}
+    assert elapsed < 0.09
+    assert set(scheduler.timings) == {"first", "second", "combined"}
+
+@pytest.mark.asyncio
+async def test_stage_timeout():
+    """A stage exceeding its timeout fails the run"""
+    async def hang():
+        await asyncio.sleep(1)
+
+    scheduler = StageScheduler([Stage("hang", hang, timeout=0.01)])
+    with pytest.raises(asyncio.TimeoutError):
+        await scheduler.run()
+
+def test_cycles_are_rejected():
+    """Dependency cycles are rejected up front"""
+    async def noop(**kwargs):
+        return None
+
+    with pytest.raises(ValueError):
+        StageScheduler([
+            Stage("a", noop, depends_on=["b"]),
+            Stage("b", noop, depends_on=["a"])
+        ])
@@ -0,0 +1,72 @@
+import pytest
+from app.agent import prompt_builder
+from app.agent.prompt_builder import (
+    build_draft_analysis,
+    build_legal_analysis_prompt,
+    build_next_steps_prompt,
+    estimate_tokens,
+    truncate_to_tokens
+)
+from app.agent.tools.next_steps import NextStepsTool
+from app.services import llm
+from app.services.llm_cache import llm_cache
+from app.services.llm_providers import FakeLLMService
+
+def test_templates_are_loaded_once():
+    """Templates are read from disk once per process"""
+    prompt_builder.load_template.cache_clear()
+    build_legal_analysis_prompt("Title", "Description", "Labour Law", "Pune")
+    build_legal_analysis_prompt("Title", "Description", "Labour Law", "Pune")
+    info = prompt_builder.load_template.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+def test_truncation_is_deterministic_and_within_budget():
+    """Long descriptions are cut at a word boundary and the same input gives the same prompt"""
+    description = " ".join(f"word{i}" for i in range(5000))
+    first = build_legal_analysis_prompt("Title", description, "Labour Law", "Pune")
+    second = build_legal_analysis_prompt("Title", description, "Labour Law", "Pune")
+    assert first == second
+    assert estimate_tokens(first) <= prompt_builder.settings.prompt_analysis_max_tokens
+    assert prompt_builder.TRUNCATION_MARKER in first
+    assert truncate_to_tokens("short text", 100) == "short text"
+
+def test_next_steps_prompt_embeds_analysis_text_only(monkeypatch):
+    """Only the analysis text reaches the prompt, not the repr of the result dict"""
+    monkeypatch.setattr(prompt_builder.settings, "prompt_next_steps_max_tokens", 400)
+    analysis = {"analysis": "Consumer forum " * 500, "source": "gemini"}
+    prompt = build_next_steps_prompt("Title", "Faulty product " * 500, "Consumer Protection", "Delhi", analysis)
+    assert "'source'" not in prompt
+    assert "{'analysis'" not in prompt
+    assert estimate_tokens(prompt) <= 400
+    assert "Consumer forum" in prompt
+    assert "Faulty product" in prompt
+
+def test_draft_analysis_is_capped(monkeypatch):
+    monkeypatch.setattr(prompt_builder.settings, "draft_analysis_max_tokens", 50)
+    section = build_draft_analysis({"analysis": "x " * 1000, "source": "gemini"})
+    assert estimate_tokens(section) <= 50
+
+@pytest.mark.asyncio
+async def test_next_steps_tool_uses_budgeted_prompt(monkeypatch):
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    provider = FakeLLMService(latency_distribution="fixed", latency_mean=0)
+    prompts = []
+    original = provider._generate_content
+
+    async def record(prompt, response_schema=None):
+        prompts.append(prompt)
+        return await original(prompt, response_schema)
+
+    monkeypatch.setattr(provider, "_generate_content", record)
+    monkeypatch.setattr(llm, "_provider", provider)
+    steps = await NextStepsTool().run({
+        "title": "Unpaid wages",
+        "description": "Employer has not paid wages",
+        "category": "Labour Law",
+        "location": "Mumbai",
+        "analysis": {"analysis": "Approach the labour commissioner", "source": "fake"}
+    })
+    assert steps
+    assert len(prompts) == 1
+    assert "Legal Analysis: Approach the labour commissioner" in prompts[0]
@@ -0,0 +1,102 @@
+import asyncio
+import httpx
+import pytest
+from app.config import settings
+from app.services.gemini_service import GeminiService
+from app.services.resilience import AdaptiveLimiter, CircuitBreaker, CircuitOpenError, UpstreamUnavailableError
+
+def test_circuit_breaker_opens_and_recovers():
+    """The breaker fails fast after repeated failures and closes after a good probe"""
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    breaker.check()  # recovery timeout elapsed, probe allowed
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_released_probe_lets_the_next_call_probe():
+    """A probe that ends without an outcome does not leave the breaker half-open forever"""
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.check() is True
+    breaker.release_probe()
+    assert breaker.check() is True
+    breaker.record_success()
+    assert breaker.check() is False
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_on_throttling():
+    """The in-flight limit halves on overload and grows back on fast calls"""
+    limiter = AdaptiveLimiter(initial_limit=8, min_limit=1, max_limit=10, latency_target=1.0)
+    await limiter.acquire()
+    await limiter.release(0.1, overloaded=True)
+    assert limiter.limit == 4
+    await limiter.acquire()
+    await limiter.release(0.1)
+    assert limiter.limit == 5
+    assert limiter.get_stats()["throttled_total"] == 1
+
+@pytest.mark.asyncio
+async def test_generate_content_retries_retryable_status(monkeypatch):
+    """A 503 is retried and the following success is returned"""
+    responses = iter([
+        httpx.Response(503, json={"error": "unavailable"}),
+        httpx.Response(200, json={"candidates": [{"content": {"parts": [{"text": "ok"}]}}]})
+    ])
+    monkeypatch.setattr(settings, "gemini_retry_base_delay", 0.0)
+    service = GeminiService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: next(responses)))
+    assert await service._generate_content("prompt") == "ok"
+    assert service.get_admission_stats()["retries_total"] == 1
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+    await service.shutdown()
+
+@pytest.mark.asyncio
+async def test_limiter_halves_once_per_burst():
+    """Slow calls that were in flight together halve the limit only once"""
+    limiter = AdaptiveLimiter(initial_limit=8, min_limit=1, max_limit=10, latency_target=1.0)
+    for _ in range(4):
+        await limiter.acquire()
+    for _ in range(4):
+        await limiter.release(5.0)
+    assert limiter.limit == 4
+    await limiter.acquire()
+    await limiter.release(0.0, overloaded=True)
+    assert limiter.limit == 2
+
+@pytest.mark.asyncio
+async def test_generate_content_raises_when_retries_run_out(monkeypatch):
+    """Exhausted retries surface as UpstreamUnavailableError instead of None"""
+    monkeypatch.setattr(settings, "gemini_retry_base_delay", 0.0)
+    monkeypatch.setattr(settings, "gemini_max_retries", 1)
+    service = GeminiService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(503, headers={"Retry-After": "0"})
+    ))
+    with pytest.raises(UpstreamUnavailableError):
+        await service._generate_content("prompt")
+    await service.shutdown()
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_is_released(monkeypatch):
+    """Cancelling the half-open probe mid-request lets the next call probe"""
+    service = GeminiService()
+    service.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    service.circuit_breaker.record_failure()
+
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(hang))
+    call = asyncio.ensure_future(service._generate_content("prompt"))
+    await asyncio.sleep(0.01)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert service.circuit_breaker.check() is True
+    await service.shutdown()
@@ -0,0 +1,68 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from httpx import AsyncClient
+
+from app.responses import CompressionMiddleware, default_response_class
+
+@pytest.fixture
+def client():
+    app = FastAPI(default_response_class=default_response_class())
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large():
+        return {"draft": "legal notice " * 500}
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    @app.get("/events")
+    async def stream():
+        return StreamingResponse(iter(["event: a\n\n" * 200]), media_type="text/event-stream")
+
+    @app.get("/tagged")
+    async def tagged():
+        return Response(content=b"{}" + b" " * 2000, media_type="application/json", headers={"ETag": '"abc"'})
+
+    return AsyncClient(app=app, base_url="http://test")
+
+def test_orjson_is_the_default_response_class():
+    assert default_response_class() is ORJSONResponse
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding, decompress", [("br", brotli.decompress), ("gzip", gzip.decompress)])
+async def test_large_bodies_are_compressed(client, encoding, decompress):
+    response = await client.get("/large", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) < 500
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["draft"].startswith("legal notice")
+
+@pytest.mark.asyncio
+async def test_small_bodies_and_streams_are_sent_as_is(client):
+    small = await client.get("/small", headers={"Accept-Encoding": "br, gzip"})
+    assert "content-encoding" not in small.headers
+    stream = await client.get("/events", headers={"Accept-Encoding": "br, gzip"})
+    assert "content-encoding" not in stream.headers
+    assert stream.text.startswith("event: a")
+
+@pytest.mark.asyncio
+async def test_compressed_bodies_get_a_weak_etag(client):
+    identity = await client.get("/tagged", headers={"Accept-Encoding": "identity"})
+    assert identity.headers["etag"] == '"abc"'
+    for encoding in ("br", "gzip"):
+        compressed = await client.get("/tagged", headers={"Accept-Encoding": encoding})
+        assert compressed.headers["content-encoding"] == encoding
+        assert compressed.headers["etag"] == 'W/"abc"'
+
+@pytest.mark.asyncio
+async def test_zero_quality_codings_are_refused(client):
+    response = await client.get("/large", headers={"Accept-Encoding": "br;q=0, gzip;q=0.5"})
+    assert response.headers["content-encoding"] == "gzip"
+    response = await client.get("/large", headers={"Accept-Encoding": "br;q=0, gzip;q=0"})
+    assert "content-encoding" not in response.headers
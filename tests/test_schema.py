@@ -0,0 +1,27 @@
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from app.models.schema_check import find_index_drift
+
+def _migrate(connection):
+    config = Config("alembic.ini")
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+def test_migrations_deploy_exactly_the_declared_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    with engine.begin() as conn:
+        _migrate(conn)
+        assert find_index_drift(conn) == []
+
+def test_drift_check_reports_missing_and_undeclared_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    with engine.begin() as conn:
+        _migrate(conn)
+        conn.execute(text("DROP INDEX idx_feedback_case_rating"))
+        conn.execute(text("CREATE INDEX idx_stray ON cases (category)"))
+        assert find_index_drift(conn) == [
+            "cases.idx_stray: deployed but not declared",
+            "feedback.idx_feedback_case_rating: declared but not deployed"
+        ]
@@ -0,0 +1,51 @@
+import json
+from app.agent.structured_output import (
+    LEGAL_ANALYSIS_SCHEMA,
+    parse_legal_analysis,
+    parse_next_steps,
+    render_legal_analysis
+)
+from app.models.case_schema import CaseResponse
+from app.services.gemini_service import GeminiService
+
+def test_parse_next_steps_validates_once():
+    text = json.dumps({"steps": [{"step": "File a complaint", "actions": ["Draft it", "Submit it"], "timeline": "7 days"}]})
+    assert parse_next_steps(text) == [
+        {"step": "File a complaint", "actions": ["Draft it", "Submit it"], "timeline": "7 days"}
+    ]
+    assert parse_next_steps("1. File a complaint") is None
+    assert parse_next_steps(json.dumps({"steps": [{"actions": []}]})) is None
+
+def test_legal_analysis_renders_readable_text():
+    result = parse_legal_analysis(json.dumps({
+        "laws": [{"act": "Consumer Protection Act, 2019", "section": "Section 35"}],
+        "grounds": ["Defective goods"],
+        "steps": [{"step": "Send a legal notice", "actions": [], "timeline": "15 days"}],
+        "challenges": ["Proof of purchase"]
+    }))
+    text = render_legal_analysis(result)
+    assert "- Consumer Protection Act, 2019, Section 35" in text
+    assert "- Send a legal notice (15 days)" in text
+
+def test_gemini_payload_requests_json_schema():
+    payload = GeminiService()._build_payload("prompt", LEGAL_ANALYSIS_SCHEMA)
+    assert payload["generationConfig"] == {
+        "responseMimeType": "application/json",
+        "responseSchema": LEGAL_ANALYSIS_SCHEMA
+    }
+    assert "generationConfig" not in GeminiService()._build_payload("prompt")
+
+def test_case_response_serves_stored_steps_without_reshaping():
+    """Structured steps pass through as-is; steps stored before this change stay strings"""
+    response = CaseResponse.model_validate({
+        "id": 1,
+        "case_id": "abc",
+        "title": "t",
+        "description": "d",
+        "category": "c",
+        "status": "pending",
+        "created_at": "2024-01-01T00:00:00",
+        "next_steps": [{"step": "File a complaint", "actions": ["Submit it"]}, "Legacy step"]
+    })
+    assert response.next_steps[0].actions == ["Submit it"]
+    assert response.next_steps[1] == "Legacy step"